@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class BaseConfig(AppConfig):
+    name = "apps.base"
+    label = "base"
+
+    def ready(self):
+        from apps.base import signals  # noqa: F401
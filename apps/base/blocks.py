@@ -1,5 +1,7 @@
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.embeds.blocks import EmbedBlock
+from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.exceptions import EmbedException
 from wagtail.blocks import (
     CharBlock,
     ChoiceBlock,
@@ -9,6 +11,8 @@ from wagtail.blocks import (
     TextBlock,
 )
 
+from apps.base.embeds import get_stored_embed
+
 
 class ImageBlock(StructBlock):
     """
@@ -60,10 +64,46 @@ class BlockQuote(StructBlock):
         template = "blocks/blockquote.html"
 
 
+class StoredEmbedBlock(EmbedBlock):
+    """
+    `EmbedBlock` that renders the embeds stored when the page was published
+    (see apps/base/embeds.py) instead of fetching them from the provider.
+    With `facade=True` only the thumbnail is shown, and the player is loaded
+    when it's clicked.
+    """
+
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        context["embed"] = None
+        context["facade"] = self.meta.facade
+        if value:
+            request = (parent_context or {}).get("request")
+            if getattr(request, "is_preview", False):
+                # Previews may show embeds that haven't been published yet
+                try:
+                    context["embed"] = get_embed(
+                        value.url, value.max_width, value.max_height
+                    )
+                except EmbedException:
+                    pass
+            else:
+                context["embed"] = get_stored_embed(
+                    value.url, value.max_width, value.max_height
+                )
+        return context
+
+    class Meta:
+        facade = False
+
+
 # StreamBlocks
 class BaseStreamBlock(StreamBlock):
     """
     Define the custom blocks that `StreamField` will utilize
+
+    Rendered bodies are cached per page revision (see
+    apps/base/stream_cache.py); blocks whose output depends on the request
+    opt out with `cache_render = False` in their Meta.
     """
 
     heading_block = HeadingBlock()
@@ -72,8 +112,9 @@ class BaseStreamBlock(StreamBlock):
     )
     image_block = ImageBlock()
     block_quote = BlockQuote()
-    embed_block = EmbedBlock(
+    embed_block = StoredEmbedBlock(
         help_text="Insert an embed URL e.g https://www.youtube.com/embed/SGJFWirQ3ks",
         icon="fa-s15",
         template="blocks/embed_block.html",
+        facade=True,
     )
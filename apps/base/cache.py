@@ -0,0 +1,51 @@
+import time
+
+from django.core.cache import cache
+
+from apps.base.db import pin_primary
+
+# Entries are invalidated explicitly, so this only bounds how long entries
+# orphaned by a generation bump linger in the shared cache
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# Generation counters let us invalidate a whole family of cache entries
+# (e.g. every cached menu tree) by bumping a single key, instead of having
+# to know every key that was ever written.
+def generation_key(name):
+    return "generation:{}".format(name)
+
+
+def initial_generation():
+    # Counters start from the clock so that one recreated after an eviction
+    # never collides with the values embedded in keys that are still cached
+    return int(time.time() * 1000)
+
+
+def get_generation(name):
+    return get_generations(name)[0]
+
+
+def bump_generation(name):
+    # Whatever is cached next is read from the primary for a while, so it
+    # can't come from a replica that hasn't caught up, see apps/base/db.py
+    pin_primary()
+    try:
+        return cache.incr(generation_key(name))
+    except ValueError:
+        generation = initial_generation()
+        cache.set(generation_key(name), generation, None)
+        return generation
+
+
+def get_generations(*names):
+    # Reads several counters in one cache round trip
+    keys = [generation_key(name) for name in names]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, initial_generation(), None)
+            found[key] = cache.get(key)
+        generations.append(found[key])
+    return generations
@@ -0,0 +1,66 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# The replica the current request reads from; None reads from the primary,
+# which is what management commands, workers and threads get
+current_replica = ContextVar("current_replica", default=None)
+
+PIN_KEY = "db:primary-pinned-until"
+
+
+def pin_primary():
+    """
+    Sends every read to the primary for REPLICA_PIN_SECONDS, long enough
+    for the replicas to catch up with a change. Called whenever content
+    changes, so nobody sees an unpublished page reappear, and the caches
+    being rebuilt don't store what a lagging replica returns.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(PIN_KEY, time.time() + settings.REPLICA_PIN_SECONDS, None)
+
+
+def is_primary_pinned():
+    return (cache.get(PIN_KEY) or 0) > time.time()
+
+
+def choose_replica(request):
+    """
+    Returns the replica to read from for a request, or None for the
+    primary. Only anonymous reads go to a replica: editors and signed-in
+    visitors, who have a session, read their own writes from the primary.
+    """
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if request.method not in ("GET", "HEAD"):
+        return None
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return None
+    if is_primary_pinned():
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """
+    Routes the reads of anonymous public requests to the replicas listed in
+    DATABASE_REPLICAS, see ReplicaMiddleware. Everything else, and every
+    write, goes to the primary. Replicas mirror the primary, so they are
+    never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
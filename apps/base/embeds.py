@@ -0,0 +1,82 @@
+import logging
+
+from django.utils.html import format_html
+
+from wagtail.embeds.embeds import get_embed, get_embed_hash
+from wagtail.embeds.exceptions import EmbedException
+from wagtail.embeds.finders.base import EmbedFinder
+from wagtail.embeds.models import Embed
+from wagtail.fields import StreamField
+
+logger = logging.getLogger(__name__)
+
+
+def get_stored_embed(url, max_width=None, max_height=None):
+    # Only reads what was stored when the page was published, even if it has
+    # expired; never calls out to the provider
+    return Embed.objects.filter(hash=get_embed_hash(url, max_width, max_height)).first()
+
+
+def get_page_embeds(page):
+    """
+    Yields the (url, max_width, max_height) of every StoredEmbedBlock in the
+    StreamFields of a page, read from the raw JSON.
+    """
+    from apps.base.blocks import StoredEmbedBlock
+
+    for field in page._meta.get_fields():
+        if not isinstance(field, StreamField):
+            continue
+        stream_value = getattr(page, field.name)
+        for block in stream_value.raw_data:
+            child_block = stream_value.stream_block.child_blocks.get(block["type"])
+            if isinstance(child_block, StoredEmbedBlock) and block["value"]:
+                yield (
+                    block["value"],
+                    getattr(child_block.meta, "max_width", None),
+                    getattr(child_block.meta, "max_height", None),
+                )
+
+
+def prefetch_embeds(page):
+    """
+    Resolves and stores the embeds of a page, refreshing expired ones, so
+    rendering it never has to wait on a provider.
+    """
+    for url, max_width, max_height in get_page_embeds(page):
+        try:
+            get_embed(url, max_width, max_height)
+        except EmbedException:
+            logger.warning("Failed to fetch embed %s on page %d", url, page.pk)
+
+
+class LocalEmbedFinder(EmbedFinder):
+    """
+    Serves every URL as a video without any network access. Select it in
+    WAGTAILEMBEDS_FINDERS for tests and offline development, e.g.
+    {"class": "apps.base.embeds.LocalEmbedFinder", "thumbnail_url": "..."}
+    """
+
+    def __init__(self, thumbnail_url="", **options):
+        self.thumbnail_url = thumbnail_url
+
+    def accept(self, url):
+        return True
+
+    def find_embed(self, url, max_width=None, max_height=None):
+        width, height = max_width or 640, max_height or 360
+        return {
+            "title": url,
+            "author_name": "",
+            "provider_name": "Local",
+            "type": "video",
+            "thumbnail_url": self.thumbnail_url,
+            "width": width,
+            "height": height,
+            "html": format_html(
+                '<iframe src="{}" width="{}" height="{}" allowfullscreen></iframe>',
+                url,
+                width,
+                height,
+            ),
+        }
@@ -0,0 +1,34 @@
+from wagtail.images.models import Image
+
+from apps.base.renditions import GALLERY_FILTER_SPEC, all_responsive_specs
+
+GALLERY_PAGE_SIZE = 24
+
+
+def parse_cursor(value):
+    # The cursor is the ID of the last image on the previous page
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def get_gallery_images(collection, after=None, limit=GALLERY_PAGE_SIZE):
+    """
+    Returns one page of a collection's images using keyset (seek)
+    pagination on the image ID, together with the cursor for the next page
+    (None on the last page). Renditions for every responsive variant of the
+    gallery filter spec are fetched for the whole page in a single query.
+    """
+    images = (
+        Image.objects.filter(collection=collection)
+        .order_by("pk")
+        .prefetch_renditions(*all_responsive_specs(GALLERY_FILTER_SPEC))
+    )
+    if after is not None:
+        images = images.filter(pk__gt=after)
+
+    # Fetch one extra row to find out whether there is a next page
+    images = list(images[: limit + 1])
+    next_cursor = images[limit - 1].pk if len(images) > limit else None
+    return images[:limit], next_cursor
@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.base.management.utils import parse_since
+from apps.base.renditions import (
+    collect_renditions,
+    find_missing_renditions,
+    generate_renditions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the image renditions the site's templates will request, so "
+        "that visitors don't pay for generating them on first view"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--changed-since",
+            help="Only consider pages published and images uploaded since this "
+            "ISO 8601 date or datetime",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes (default: number of CPUs)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many renditions are missing",
+        )
+
+    def handle(self, *args, **options):
+        changed_since = None
+        if options["changed_since"]:
+            changed_since = parse_since(options["changed_since"])
+
+        renditions = collect_renditions(changed_since=changed_since)
+        missing = find_missing_renditions(renditions)
+        total = sum(len(specs) for specs in missing.values())
+        self.stdout.write(
+            "%d renditions requested, %d missing across %d images"
+            % (
+                sum(len(specs) for specs in renditions.values()),
+                total,
+                len(missing),
+            )
+        )
+        if not total or options["dry_run"]:
+            return
+
+        # Worker processes must open their own database connections
+        connections.close_all()
+
+        done = failed = 0
+        started = time.monotonic()
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=django.setup
+        ) as executor:
+            futures = [
+                executor.submit(generate_renditions, image_id, sorted(specs))
+                for image_id, specs in missing.items()
+            ]
+            for future in as_completed(futures):
+                generated, errors = future.result()
+                done += generated + errors
+                failed += errors
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    "%d/%d renditions (%d failed), %.1f/s"
+                    % (done, total, failed, done / elapsed if elapsed else 0)
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated %d renditions in %.1fs (%.1f/s), %d failed"
+                % (done - failed, elapsed, (done - failed) / elapsed, failed)
+            )
+        )
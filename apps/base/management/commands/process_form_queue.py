@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.base.submissions import process_queue
+
+
+class Command(BaseCommand):
+    help = "Save queued form submissions and send their emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of queued submissions to process per batch (default: 100)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling the queue when it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls with --loop (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_queue(batch_size=options["batch_size"])
+            if processed:
+                self.stdout.write("Processed %d form submissions" % processed)
+                continue
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,88 @@
+from asgiref.sync import sync_to_async
+
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.base import page_cache
+from apps.base.db import choose_replica, current_replica
+from apps.base.rich_text import RichTextReferences, current_references
+
+# The middlewares run in sync and async mode, like Django's own: under
+# ASGI a sync-only middleware would turn every async view back into a sync
+# one running in the worker's single sync thread.
+
+
+class PageCacheMiddleware(MiddlewareMixin):
+    """
+    Serves anonymous visitors from the full-page cache without resolving
+    the URL or routing through the page tree. Responses are only stored when
+    a page using PageCacheMixin has marked them cacheable.
+    """
+
+    def process_request(self, request):
+        if not page_cache.is_cacheable(request):
+            return None
+        response = page_cache.get_cached_response(request)
+        if response is not None:
+            response["X-Page-Cache"] = "hit"
+        return response
+
+    def process_response(self, request, response):
+        # Cache hits and other views never carry dependencies
+        page_ids = getattr(response, "page_cache_dependencies", None)
+        if (
+            page_ids is not None
+            and request.method == "GET"
+            and page_cache.is_cacheable(request)
+        ):
+            page_cache.cache_response(request, response, page_ids)
+            response["X-Page-Cache"] = "miss"
+        return response
+
+
+class RichTextReferencesMiddleware(MiddlewareMixin):
+    """
+    Gives each request its own map of the pages, documents and images linked
+    from rich text, so links are resolved in bulk, see apps/base/rich_text.py.
+    """
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        token = current_references.set(RichTextReferences(request))
+        try:
+            return self.get_response(request)
+        finally:
+            current_references.reset(token)
+
+    async def __acall__(self, request):
+        # Views run through sync_to_async see this context's references
+        token = current_references.set(RichTextReferences(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            current_references.reset(token)
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """
+    Sends the reads of anonymous public requests to a replica, see
+    apps/base/db.py. It comes after PageCacheMiddleware, so cache hits don't
+    pay for the routing decision.
+    """
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        token = current_replica.set(choose_replica(request))
+        try:
+            return self.get_response(request)
+        finally:
+            current_replica.reset(token)
+
+    async def __acall__(self, request):
+        replica = await sync_to_async(choose_replica)(request)
+        token = current_replica.set(replica)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_replica.reset(token)
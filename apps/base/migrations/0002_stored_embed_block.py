@@ -0,0 +1,359 @@
+# Generated by Django 4.1.13 on 2026-10-18 00:40
+
+import apps.base.blocks
+from django.db import migrations
+import wagtail.blocks
+import wagtail.fields
+import wagtail.images.blocks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="formpage",
+            name="body",
+            field=wagtail.fields.StreamField(
+                [
+                    (
+                        "heading_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "heading_text",
+                                    wagtail.blocks.CharBlock(
+                                        form_classname="title", required=True
+                                    ),
+                                ),
+                                (
+                                    "size",
+                                    wagtail.blocks.ChoiceBlock(
+                                        blank=True,
+                                        choices=[
+                                            ("", "Select a header size"),
+                                            ("h2", "H2"),
+                                            ("h3", "H3"),
+                                            ("h4", "H4"),
+                                        ],
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "paragraph_block",
+                        wagtail.blocks.RichTextBlock(
+                            icon="fa-paragraph", template="blocks/paragraph_block.html"
+                        ),
+                    ),
+                    (
+                        "image_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "image",
+                                    wagtail.images.blocks.ImageChooserBlock(
+                                        required=True
+                                    ),
+                                ),
+                                ("caption", wagtail.blocks.CharBlock(required=False)),
+                                (
+                                    "attribution",
+                                    wagtail.blocks.CharBlock(required=False),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "block_quote",
+                        wagtail.blocks.StructBlock(
+                            [
+                                ("text", wagtail.blocks.TextBlock()),
+                                (
+                                    "attribute_name",
+                                    wagtail.blocks.CharBlock(
+                                        blank=True,
+                                        label="e.g. Mary Berry",
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "embed_block",
+                        apps.base.blocks.StoredEmbedBlock(
+                            facade=True,
+                            help_text="Insert an embed URL e.g https://www.youtube.com/embed/SGJFWirQ3ks",
+                            icon="fa-s15",
+                            template="blocks/embed_block.html",
+                        ),
+                    ),
+                ],
+                use_json_field=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gallerypage",
+            name="body",
+            field=wagtail.fields.StreamField(
+                [
+                    (
+                        "heading_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "heading_text",
+                                    wagtail.blocks.CharBlock(
+                                        form_classname="title", required=True
+                                    ),
+                                ),
+                                (
+                                    "size",
+                                    wagtail.blocks.ChoiceBlock(
+                                        blank=True,
+                                        choices=[
+                                            ("", "Select a header size"),
+                                            ("h2", "H2"),
+                                            ("h3", "H3"),
+                                            ("h4", "H4"),
+                                        ],
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "paragraph_block",
+                        wagtail.blocks.RichTextBlock(
+                            icon="fa-paragraph", template="blocks/paragraph_block.html"
+                        ),
+                    ),
+                    (
+                        "image_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "image",
+                                    wagtail.images.blocks.ImageChooserBlock(
+                                        required=True
+                                    ),
+                                ),
+                                ("caption", wagtail.blocks.CharBlock(required=False)),
+                                (
+                                    "attribution",
+                                    wagtail.blocks.CharBlock(required=False),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "block_quote",
+                        wagtail.blocks.StructBlock(
+                            [
+                                ("text", wagtail.blocks.TextBlock()),
+                                (
+                                    "attribute_name",
+                                    wagtail.blocks.CharBlock(
+                                        blank=True,
+                                        label="e.g. Mary Berry",
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "embed_block",
+                        apps.base.blocks.StoredEmbedBlock(
+                            facade=True,
+                            help_text="Insert an embed URL e.g https://www.youtube.com/embed/SGJFWirQ3ks",
+                            icon="fa-s15",
+                            template="blocks/embed_block.html",
+                        ),
+                    ),
+                ],
+                blank=True,
+                use_json_field=True,
+                verbose_name="Page body",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="homepage",
+            name="body",
+            field=wagtail.fields.StreamField(
+                [
+                    (
+                        "heading_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "heading_text",
+                                    wagtail.blocks.CharBlock(
+                                        form_classname="title", required=True
+                                    ),
+                                ),
+                                (
+                                    "size",
+                                    wagtail.blocks.ChoiceBlock(
+                                        blank=True,
+                                        choices=[
+                                            ("", "Select a header size"),
+                                            ("h2", "H2"),
+                                            ("h3", "H3"),
+                                            ("h4", "H4"),
+                                        ],
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "paragraph_block",
+                        wagtail.blocks.RichTextBlock(
+                            icon="fa-paragraph", template="blocks/paragraph_block.html"
+                        ),
+                    ),
+                    (
+                        "image_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "image",
+                                    wagtail.images.blocks.ImageChooserBlock(
+                                        required=True
+                                    ),
+                                ),
+                                ("caption", wagtail.blocks.CharBlock(required=False)),
+                                (
+                                    "attribution",
+                                    wagtail.blocks.CharBlock(required=False),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "block_quote",
+                        wagtail.blocks.StructBlock(
+                            [
+                                ("text", wagtail.blocks.TextBlock()),
+                                (
+                                    "attribute_name",
+                                    wagtail.blocks.CharBlock(
+                                        blank=True,
+                                        label="e.g. Mary Berry",
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "embed_block",
+                        apps.base.blocks.StoredEmbedBlock(
+                            facade=True,
+                            help_text="Insert an embed URL e.g https://www.youtube.com/embed/SGJFWirQ3ks",
+                            icon="fa-s15",
+                            template="blocks/embed_block.html",
+                        ),
+                    ),
+                ],
+                blank=True,
+                use_json_field=True,
+                verbose_name="Home content block",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="standardpage",
+            name="body",
+            field=wagtail.fields.StreamField(
+                [
+                    (
+                        "heading_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "heading_text",
+                                    wagtail.blocks.CharBlock(
+                                        form_classname="title", required=True
+                                    ),
+                                ),
+                                (
+                                    "size",
+                                    wagtail.blocks.ChoiceBlock(
+                                        blank=True,
+                                        choices=[
+                                            ("", "Select a header size"),
+                                            ("h2", "H2"),
+                                            ("h3", "H3"),
+                                            ("h4", "H4"),
+                                        ],
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "paragraph_block",
+                        wagtail.blocks.RichTextBlock(
+                            icon="fa-paragraph", template="blocks/paragraph_block.html"
+                        ),
+                    ),
+                    (
+                        "image_block",
+                        wagtail.blocks.StructBlock(
+                            [
+                                (
+                                    "image",
+                                    wagtail.images.blocks.ImageChooserBlock(
+                                        required=True
+                                    ),
+                                ),
+                                ("caption", wagtail.blocks.CharBlock(required=False)),
+                                (
+                                    "attribution",
+                                    wagtail.blocks.CharBlock(required=False),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "block_quote",
+                        wagtail.blocks.StructBlock(
+                            [
+                                ("text", wagtail.blocks.TextBlock()),
+                                (
+                                    "attribute_name",
+                                    wagtail.blocks.CharBlock(
+                                        blank=True,
+                                        label="e.g. Mary Berry",
+                                        required=False,
+                                    ),
+                                ),
+                            ]
+                        ),
+                    ),
+                    (
+                        "embed_block",
+                        apps.base.blocks.StoredEmbedBlock(
+                            facade=True,
+                            help_text="Insert an embed URL e.g https://www.youtube.com/embed/SGJFWirQ3ks",
+                            icon="fa-s15",
+                            template="blocks/embed_block.html",
+                        ),
+                    ),
+                ],
+                blank=True,
+                use_json_field=True,
+                verbose_name="Page body",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.1.13 on 2026-10-18 00:57
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0076_modellogentry_revision"),
+        ("wagtailforms", "0005_alter_formsubmission_form_data"),
+        ("base", "0002_stored_embed_block"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedSubmission",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "form_data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("submitted_at", models.DateTimeField(auto_now_add=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                (
+                    "page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.page",
+                    ),
+                ),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailforms.formsubmission",
+                    ),
+                ),
+            ],
+        ),
+    ]
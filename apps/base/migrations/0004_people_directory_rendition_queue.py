@@ -0,0 +1,92 @@
+# Generated by Django 4.1.13 on 2026-10-18 01:01
+
+import apps.base.page_cache
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wagtailcore", "0076_modellogentry_revision"),
+        ("wagtailimages", "0024_index_image_file_hash"),
+        ("base", "0003_queued_submission"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RenditionQueueEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("filter_spec", models.CharField(max_length=255)),
+                ("queued_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name_plural": "Rendition queue entries",
+            },
+        ),
+        migrations.CreateModel(
+            name="StaffDirectoryPage",
+            fields=[
+                (
+                    "page_ptr",
+                    models.OneToOneField(
+                        auto_created=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        parent_link=True,
+                        primary_key=True,
+                        serialize=False,
+                        to="wagtailcore.page",
+                    ),
+                ),
+                (
+                    "introduction",
+                    models.TextField(blank=True, help_text="Text to describe the page"),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+            bases=(apps.base.page_cache.PageCacheMixin, "wagtailcore.page"),
+        ),
+        migrations.AddIndex(
+            model_name="people",
+            index=models.Index(
+                fields=["last_name", "first_name", "id"],
+                name="base_people_last_na_9673d5_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="staffdirectorypage",
+            name="image",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Landscape mode only; horizontal width between 1000px and 3000px.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="wagtailimages.image",
+            ),
+        ),
+        migrations.AddField(
+            model_name="renditionqueueentry",
+            name="image",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="wagtailimages.image",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="renditionqueueentry",
+            unique_together={("image", "filter_spec")},
+        ),
+    ]
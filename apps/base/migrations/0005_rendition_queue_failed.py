@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("base", "0004_people_directory_rendition_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="renditionqueueentry",
+            name="failed",
+            field=models.BooleanField(default=False),
+        ),
+    ]
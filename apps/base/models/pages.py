@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 from modelcluster.fields import ParentalKey
@@ -11,12 +13,28 @@ from wagtail.admin.panels import (
     MultiFieldPanel,
 )
 from wagtail.fields import RichTextField, StreamField
+from wagtail.images import get_image_model
 from wagtail.models import Collection, Page
-from wagtail.contrib.forms.models import AbstractEmailForm, AbstractFormField
+from wagtail.contrib.forms.models import (
+    AbstractEmailForm,
+    AbstractFormField,
+    FormSubmission,
+)
 from apps.base.blocks import BaseStreamBlock
+from apps.base.cache import CACHE_TIMEOUT, get_generation
+from apps.base.form_exports import StreamingSubmissionsListView
+from apps.base.page_cache import PageCacheMixin
+from apps.base.people import get_people, get_thumbnails, parse_cursor
+from apps.base.renditions import (
+    FEATURED_SECTION_FILTER_SPECS,
+    HERO_FILTER_SPEC,
+    PROMO_FILTER_SPEC,
+    all_responsive_specs,
+    get_renditions,
+)
 
 
-class StandardPage(Page):
+class StandardPage(PageCacheMixin, Page):
     """
     A generic content page. On this demo site we use it for an about page but
     it could be used for any type of page content that only needs a title,
@@ -42,7 +60,7 @@ class StandardPage(Page):
     ]
 
 
-class HomePage(Page):
+class HomePage(PageCacheMixin, Page):
     """
     The Home Page. This looks slightly more complicated than it is. You can
     see if you visit your site and edit the homepage that it is split between
@@ -200,11 +218,122 @@ class HomePage(Page):
         ),
     ]
 
+    # Number of children shown as cards for each featured section
+    featured_section_limits = {
+        "featured_section_1": 3,
+        "featured_section_2": 3,
+        "featured_section_3": 6,
+    }
+
+    def get_featured_content(self):
+        """
+        Everything the home page template renders from other pages and
+        images: the hero CTA link, the hero and promo images, and a card for
+        each of the first live children of the featured sections. Images
+        carry all the renditions the template asks for. Loaded in a fixed
+        number of queries and cached until any page or image changes.
+
+        Cards are plain dicts rather than pages, as pages with StreamFields
+        can't be pickled into the cache.
+        """
+        key = "homepage:{}:{}".format(self.pk, get_generation("homepage"))
+        content = cache.get(key)
+        if content is None:
+            content = self.load_featured_content()
+            cache.set(key, content, CACHE_TIMEOUT)
+        return content
+
+    def load_featured_content(self):
+        pages = Page.objects.filter(
+            pk__in=[
+                self.hero_cta_link_id,
+                *(
+                    getattr(self, field + "_id")
+                    for field in FEATURED_SECTION_FILTER_SPECS
+                ),
+            ]
+        ).in_bulk()
+
+        sections = {}
+        specs = {}
+        for field, limit in self.featured_section_limits.items():
+            section = pages.get(getattr(self, field + "_id"))
+            if section is None:
+                sections[field] = []
+                continue
+            children = list(Page.objects.child_of(section).live().specific()[:limit])
+            sections[field] = children
+            for child in children:
+                specs.setdefault(getattr(child, "image_id", None), set()).update(
+                    all_responsive_specs(FEATURED_SECTION_FILTER_SPECS[field])
+                )
+        specs.setdefault(self.image_id, set()).update(
+            [HERO_FILTER_SPEC, HERO_FILTER_SPEC + "|format-webp"]
+        )
+        specs.setdefault(self.promo_image_id, set()).update(
+            all_responsive_specs(PROMO_FILTER_SPEC)
+        )
+        specs.pop(None, None)
+
+        images = (
+            get_image_model()
+            .objects.filter(pk__in=specs)
+            .prefetch_renditions(*set().union(*specs.values()))
+            .in_bulk()
+        )
+        for image in images.values():
+            # Generates any missing renditions up front, so the cached
+            # images carry every rendition the template asks for
+            image.prefetched_renditions = list(
+                get_renditions(image, specs[image.pk]).values()
+            )
+        hero_cta_link = pages.get(self.hero_cta_link_id)
+        return {
+            "hero_cta_url": hero_cta_link.get_url() if hero_cta_link else None,
+            "image": images.get(self.image_id),
+            "promo_image": images.get(self.promo_image_id),
+            "sections": {
+                field: [
+                    {
+                        "id": child.pk,
+                        "title": child.title,
+                        "url": child.get_url(),
+                        "introduction": getattr(child, "introduction", ""),
+                        "image": images.get(getattr(child, "image_id", None)),
+                    }
+                    for child in children
+                ]
+                for field, children in sections.items()
+            },
+        }
+
+    def get_context(self, request, *args, **kwargs):
+        context = super().get_context(request, *args, **kwargs)
+        if getattr(request, "is_preview", False):
+            # Previews show unsaved changes to the fields, bypass the cache
+            context["featured"] = self.load_featured_content()
+        else:
+            context["featured"] = self.get_featured_content()
+        return context
+
+    def get_cache_dependencies(self):
+        # The hero CTA, the featured sections and the children listed in
+        # them are all rendered on the home page
+        dependencies = super().get_cache_dependencies()
+        if self.hero_cta_link_id:
+            dependencies.append(self.hero_cta_link_id)
+        content = self.get_featured_content()
+        for field, cards in content["sections"].items():
+            if getattr(self, field + "_id"):
+                dependencies.append(getattr(self, field + "_id"))
+            dependencies += [card["id"] for card in cards]
+        return dependencies
+
     def __str__(self):
         return self.title
 
 
-class GalleryPage(Page):
+class GalleryPage(PageCacheMixin, Page):
     """
     This is a page to list locations from the selected Collection. We use a Q
     object to list any Collection created (/admin/collections/) even if they
@@ -245,6 +374,54 @@ class GalleryPage(Page):
     subpage_types = []
 
 
+class StaffDirectoryPage(PageCacheMixin, Page):
+    """
+    Lists People in alphabetical order, a page at a time.
+    Further pages are loaded by keyset cursor through the "after" query
+    string parameter, see apps/base/people.py.
+    """
+
+    introduction = models.TextField(help_text="Text to describe the page", blank=True)
+    image = models.ForeignKey(
+        "wagtailimages.Image",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        help_text="Landscape mode only; horizontal width between 1000px and 3000px.",
+    )
+
+    content_panels = Page.content_panels + [
+        FieldPanel("introduction", classname="full"),
+        FieldPanel("image"),
+    ]
+
+    subpage_types = []
+
+    def get_context(self, request, *args, **kwargs):
+        context = super().get_context(request, *args, **kwargs)
+        people, next_cursor = get_people(after=parse_cursor(request.GET.get("after")))
+        thumbnails = get_thumbnails(people)
+        context["people"] = [
+            {"person": person, "thumbnail": thumbnails.get(person.pk)}
+            for person in people
+        ]
+        context["next_cursor"] = next_cursor
+        context["thumbnails_pending"] = any(
+            person.image_id and person.pk not in thumbnails for person in people
+        )
+        return context
+
+    def serve(self, request, *args, **kwargs):
+        response = super().serve(request, *args, **kwargs)
+        # Not cached while thumbnails are being generated, so visitors see
+        # them as soon as the rendition worker is done. Thumbnails that
+        # failed to generate aren't waited for
+        if response.context_data["thumbnails_pending"]:
+            response.page_cache_dependencies = None
+        return response
+
+
 class FormField(AbstractFormField):
     """
     Wagtailforms is a module to introduce simple forms on a Wagtail site. It
@@ -289,3 +466,61 @@ class FormPage(AbstractEmailForm):
             "Email",
         ),
     ]
+
+    # Exports submissions in chunks, see apps/base/form_exports.py
+    submissions_list_view_class = StreamingSubmissionsListView
+
+    def process_form_submission(self, form):
+        # Only queued here: the `process_form_queue` worker saves submissions
+        # and sends their emails in batches, see apps/base/submissions.py
+        QueuedSubmission.objects.create(page=self, form_data=form.cleaned_data)
+
+
+class QueuedSubmission(models.Model):
+    """
+    A FormPage submission accepted but not yet saved as a FormSubmission or
+    emailed. Entries are removed once both are done; the submission is
+    kept on the entry while its email is retried.
+    """
+
+    page = models.ForeignKey(
+        "wagtailcore.Page", on_delete=models.CASCADE, related_name="+"
+    )
+    form_data = models.JSONField(encoder=DjangoJSONEncoder)
+    submitted_at = models.DateTimeField(auto_now_add=True)
+    submission = models.ForeignKey(
+        FormSubmission,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return "{} {}".format(self.page_id, self.submitted_at)
+
+
+class RenditionQueueEntry(models.Model):
+    """
+    An image rendition a request found missing, waiting to be generated by
+    the `process_rendition_queue` worker. Requests for the same rendition
+    collapse into one entry. Entries whose rendition failed to generate are
+    kept, marked as failed, until the image is saved again.
+    """
+
+    image = models.ForeignKey(
+        "wagtailimages.Image", on_delete=models.CASCADE, related_name="+"
+    )
+    filter_spec = models.CharField(max_length=255)
+    queued_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    failed = models.BooleanField(default=False)
+
+    def __str__(self):
+        return "{} {}".format(self.image_id, self.filter_spec)
+
+    class Meta:
+        unique_together = [("image", "filter_spec")]
+        verbose_name_plural = "Rendition queue entries"
@@ -13,13 +13,15 @@ from wagtail.fields import RichTextField
 from wagtail.search import index
 from wagtail.snippets.models import register_snippet
 
+from apps.base.people import get_thumbnails
+
 
-@register_snippet
 class People(index.Indexed, ClusterableModel):
     """
     A Django model to store People objects.
-    It uses the `@register_snippet` decorator to allow it to be accessible
-    via the Snippets UI (e.g. /admin/snippets/base/people/)
+    It is edited through PeopleAdmin in apps/base/wagtail_hooks.py, which
+    lists thumbnails, and isn't registered as a snippet as well, so that it
+    appears once in the admin menu.
 
     `People` uses the `ClusterableModel`, which allows the relationship with
     another model to be stored locally to the 'parent' model (e.g. a PageModel)
@@ -64,12 +66,11 @@ class People(index.Indexed, ClusterableModel):
 
     @property
     def thumb_image(self):
-        # Returns an empty string if there is no profile pic or the rendition
-        # file can't be found.
-        try:
-            return self.image.get_rendition("fill-50x50").img_tag()
-        except:  # noqa: E722 FIXME: remove bare 'except:'
-            return ""
+        # Returns an empty string if there is no profile pic or its thumbnail
+        # hasn't been generated yet. Listings prefetch the thumbnails, see
+        # apps/base/people.py
+        thumbnail = get_thumbnails([self]).get(self.pk)
+        return thumbnail.img_tag() if thumbnail else ""
 
     def __str__(self):
         return "{} {}".format(self.first_name, self.last_name)
@@ -77,6 +78,8 @@ class People(index.Indexed, ClusterableModel):
     class Meta:
         verbose_name = "Person"
         verbose_name_plural = "People"
+        # The order of the staff directory and admin listing
+        indexes = [models.Index(fields=["last_name", "first_name", "id"])]
 
 
 @register_snippet
@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.utils import translation
+
+from wagtail.models import Page, Site
+
+from apps.base.cache import CACHE_TIMEOUT, get_generation, get_generations
+
+
+# The site root's children, their dropdown items and one level below those
+MENU_DEPTH = 3
+
+
+def menu_cache_key(site, parent, locale_id):
+    return "navigation:menu:{}:{}:{}:{}".format(
+        get_generation("navigation"),
+        site.pk if site else None,
+        parent.pk,
+        locale_id,
+    )
+
+
+def build_menu_tree(request, site, root):
+    """
+    Build the live, in-menu page tree below `root` from a single query over
+    the treebeard `path`/`depth` columns. Nodes are plain dicts so the tree
+    can be pickled into the shared cache.
+    """
+    pages = (
+        Page.objects.live()
+        .in_menu()
+        .filter(
+            path__startswith=root.path,
+            depth__gt=root.depth,
+            depth__lte=root.depth + MENU_DEPTH,
+        )
+        .order_by("path")
+    )
+
+    tree = []
+    nodes = {root.path: {"children": tree}}
+    for page in pages:
+        parent_node = nodes.get(page.path[: -Page.steplen])
+        if parent_node is None:
+            # The parent isn't live or isn't shown in menus, so neither is
+            # anything below it
+            continue
+        node = {
+            "id": page.pk,
+            "title": page.title,
+            "url": page.get_url(request=request, current_site=site),
+            "url_path": page.url_path,
+            "children": [],
+        }
+        parent_node["children"].append(node)
+        nodes[page.path] = node
+    return tree
+
+
+def get_menu_tree(request, parent, calling_page=None):
+    # Pages in a non-default locale get the menu of the translated root page
+    locale_id = calling_page.locale_id if calling_page else parent.locale_id
+    site = Site.find_for_request(request)
+    key = menu_cache_key(site, parent, locale_id)
+
+    tree = cache.get(key)
+    if tree is None:
+        root = parent
+        if locale_id != parent.locale_id:
+            root = parent.get_translation_or_none(locale_id) or parent
+        tree = build_menu_tree(request, site, root)
+        cache.set(key, tree, CACHE_TIMEOUT)
+    return tree
+
+
+def with_active_state(menuitems, calling_page=None):
+    # Shallow copies, so the flags never leak back into the cached tree
+    return [
+        dict(
+            menuitem,
+            active=(
+                calling_page.url_path.startswith(menuitem["url_path"])
+                if calling_page
+                else False
+            ),
+            show_dropdown=bool(menuitem["children"]),
+        )
+        for menuitem in menuitems
+    ]
+
+
+def chrome_cache_key(fragment_name, request, page=None):
+    # The host stands in for the site so that a warm hit doesn't need a
+    # Site lookup. Menus and breadcrumbs change with the page tree, the
+    # footer with the FooterText snippet.
+    navigation, footer = get_generations("navigation", "footer")
+    return "chrome:{}:{}:{}:{}:{}:{}".format(
+        fragment_name,
+        navigation,
+        footer,
+        request.get_host(),
+        page.locale_id if page else translation.get_language(),
+        page.url_path if page else request.path,
+    )
@@ -0,0 +1,124 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import translation
+
+from wagtail.models import Page
+
+from apps.base.cache import bump_generation, get_generations
+
+# Headers that only make sense for the response they were generated for
+UNCACHED_HEADERS = {"set-cookie", "x-page-cache"}
+
+
+def is_cacheable(request):
+    """
+    Only anonymous GET/HEAD requests without a session or pending messages
+    share a response. Checking the cookies rather than `request.user` keeps
+    cache hits from touching the session store.
+    """
+    if not getattr(settings, "PAGE_CACHE_ENABLED", False):
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if getattr(request, "is_preview", False):
+        return False
+    return not (
+        settings.SESSION_COOKIE_NAME in request.COOKIES or "messages" in request.COOKIES
+    )
+
+
+def page_cache_key(request):
+    # Only the whitelisted query parameters change what a page renders, so
+    # tracking parameters and the like don't fragment the cache
+    params = getattr(settings, "PAGE_CACHE_QUERY_PARAMS", [])
+    query = sorted(
+        (name, value)
+        for name, values in request.GET.lists()
+        if name in params
+        for value in values
+    )
+    url = "{}{}?{}".format(request.get_host(), request.path, query)
+    return "pagecache:response:{}:{}:{}:{}".format(
+        *get_generations("pagecache", "footer"),
+        translation.get_language(),
+        hashlib.md5(url.encode("utf-8")).hexdigest(),
+    )
+
+
+def page_generation(page_id):
+    # Each page has its own generation counter, which entries built from the
+    # page are stored with
+    return "pagecache:page:{}".format(page_id)
+
+
+def get_cached_response(request):
+    entry = cache.get(page_cache_key(request))
+    if entry is None:
+        return None
+    status, headers, content, dependencies = entry
+    # Stale if any of the pages it was built from has been purged since
+    names = [name for name, _ in dependencies]
+    if get_generations(*names) != [generation for _, generation in dependencies]:
+        return None
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def cache_response(request, response, page_ids):
+    """
+    Store a rendered response along with the generations of every page it
+    was built from, so that publishing one of them purges just this entry.
+    """
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return
+    timeout = getattr(settings, "PAGE_CACHE_TIMEOUT", 600)
+    headers = [
+        (header, value)
+        for header, value in response.items()
+        if header.lower() not in UNCACHED_HEADERS
+    ]
+    names = [page_generation(page_id) for page_id in sorted(set(page_ids))]
+    dependencies = list(zip(names, get_generations(*names)))
+    cache.set(
+        page_cache_key(request),
+        (response.status_code, headers, response.content, dependencies),
+        timeout,
+    )
+
+
+def purge_pages(page_ids):
+    # Each bump is a single atomic increment, so concurrent purges and
+    # writes can't lose each other's updates
+    for page_id in set(page_ids):
+        bump_generation(page_generation(page_id))
+
+
+def purge_all():
+    bump_generation("pagecache")
+
+
+class PageCacheMixin:
+    """
+    Opts a page type into the full-response cache for anonymous visitors.
+    The entry depends on the pages returned by `get_cache_dependencies`;
+    the cached response itself is served by PageCacheMiddleware before the
+    request ever reaches Wagtail's routing.
+    """
+
+    def get_cache_dependencies(self):
+        # The page itself and its ancestors, whose titles are rendered in
+        # the breadcrumbs
+        return [self.pk] + list(
+            Page.objects.ancestor_of(self).values_list("pk", flat=True)
+        )
+
+    def serve(self, request, *args, **kwargs):
+        response = super().serve(request, *args, **kwargs)
+        if is_cacheable(request):
+            response.page_cache_dependencies = self.get_cache_dependencies()
+        return response
@@ -0,0 +1,95 @@
+import base64
+import json
+
+from django.db.models import Prefetch, Q
+
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+
+from apps.base.renditions import (
+    PERSON_THUMB_FILTER_SPEC,
+    enqueue_renditions,
+    find_failed_renditions,
+)
+
+PEOPLE_PAGE_SIZE = 50
+
+
+def with_thumbnails(queryset):
+    """
+    Fetches each person's image along with the people, and the thumbnail
+    renditions of all of them in one more query.
+    """
+    Rendition = get_image_model().get_rendition_model()
+    return queryset.select_related("image").prefetch_related(
+        Prefetch(
+            "image__renditions",
+            queryset=Rendition.objects.filter(filter_spec=PERSON_THUMB_FILTER_SPEC),
+            to_attr="prefetched_renditions",
+        )
+    )
+
+
+def get_thumbnails(people):
+    """
+    Returns a dict of person ID to thumbnail rendition. Thumbnails that
+    haven't been generated yet are left out and queued for the
+    `process_rendition_queue` worker, rather than generated during the
+    request. Thumbnails that the worker failed to generate map to None.
+    """
+    thumbnails = {}
+    missing = {}
+    thumb_filter = Filter(spec=PERSON_THUMB_FILTER_SPEC)
+    for person in people:
+        if person.image is None:
+            continue
+        try:
+            thumbnails[person.pk] = person.image.find_existing_rendition(thumb_filter)
+        except person.image.get_rendition_model().DoesNotExist:
+            missing[person.pk] = (person.image_id, PERSON_THUMB_FILTER_SPEC)
+    if missing:
+        failed = find_failed_renditions(missing.values())
+        for pk, rendition in missing.items():
+            if rendition in failed:
+                thumbnails[pk] = None
+        enqueue_renditions(set(missing.values()) - failed)
+    return thumbnails
+
+
+def encode_cursor(person):
+    # The sort key of the last person on the previous page
+    value = json.dumps([person.last_name, person.first_name, person.pk])
+    return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii")
+
+
+def parse_cursor(value):
+    if not value:
+        return None
+    try:
+        last_name, first_name, pk = json.loads(base64.urlsafe_b64decode(value))
+        return str(last_name), str(first_name), int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_people(after=None, limit=PEOPLE_PAGE_SIZE):
+    """
+    Returns one page of people in alphabetical order with their thumbnails
+    prefetched, using keyset (seek) pagination on (last_name, first_name,
+    id), together with the cursor for the next page (None on the last page).
+    """
+    from apps.base.models import People
+
+    people = with_thumbnails(People.objects.order_by("last_name", "first_name", "pk"))
+    if after is not None:
+        last_name, first_name, pk = after
+        people = people.filter(
+            Q(last_name__gt=last_name)
+            | Q(last_name=last_name, first_name__gt=first_name)
+            | Q(last_name=last_name, first_name=first_name, pk__gt=pk)
+        )
+
+    # Fetch one extra row to find out whether there is a next page
+    people = list(people[: limit + 1])
+    next_cursor = encode_cursor(people[limit - 1]) if len(people) > limit else None
+    return people[:limit], next_cursor
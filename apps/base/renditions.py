@@ -0,0 +1,318 @@
+import logging
+import re
+from contextlib import contextmanager, nullcontext
+
+from django.db import transaction
+
+from wagtail.images.models import Filter, Image
+from wagtail.models import Page
+
+logger = logging.getLogger(__name__)
+
+# Filter specs requested by the templates
+HERO_FILTER_SPEC = "fill-1920x600"
+PROMO_FILTER_SPEC = "fill-590x413-c100"
+IMAGE_BLOCK_FILTER_SPEC = "fill-600x338"
+LISTING_CARD_FILTER_SPEC = "fill-180x180-c100"
+LOCATION_CARD_FILTER_SPEC = "fill-430x320-c100"
+PICTURE_CARD_FILTER_SPEC = "fill-433x487-c100"
+PERSON_THUMB_FILTER_SPEC = "fill-50x50"
+GALLERY_FILTER_SPEC = "fill-645x480-c100"
+
+# Card used for the children of each HomePage featured section, see
+# templates/base/home_page.html
+FEATURED_SECTION_FILTER_SPECS = {
+    "featured_section_1": LISTING_CARD_FILTER_SPEC,
+    "featured_section_2": LOCATION_CARD_FILTER_SPEC,
+    "featured_section_3": PICTURE_CARD_FILTER_SPEC,
+}
+
+
+def get_stream_image_ids(stream_value):
+    # Reads the raw JSON so that no image is loaded just to learn its ID
+    image_ids = set()
+    for block in stream_value.raw_data:
+        if block["type"] == "image_block" and block["value"].get("image"):
+            image_ids.add(block["value"]["image"])
+    return image_ids
+
+
+def collect_renditions(changed_since=None):
+    """
+    Works out which (image, filter spec) pairs the site will request, by
+    walking live pages, the ImageBlocks in their bodies, gallery collections
+    and People. Returns a dict of image ID to a set of filter specs.
+    With `changed_since`, only pages published and images uploaded since
+    then are considered.
+    """
+    from apps.base.models import GalleryPage, HomePage, People
+
+    renditions = {}
+
+    def add(image_id, spec, responsive=True):
+        # Images rendered with the picture tag are requested at every
+        # responsive scale; backgrounds only at full size
+        if image_id:
+            specs = renditions.setdefault(image_id, set())
+            if responsive:
+                specs.update(all_responsive_specs(spec))
+            else:
+                specs.update(all_responsive_specs(spec)[-2:])
+
+    pages = Page.objects.live().specific()
+    if changed_since:
+        pages = pages.filter(last_published_at__gte=changed_since)
+
+    for page in pages.iterator():
+        image_id = getattr(page, "image_id", None)
+        # The hero image, and the thumbnail shown in search results
+        add(image_id, HERO_FILTER_SPEC, responsive=False)
+        add(image_id, LISTING_CARD_FILTER_SPEC)
+
+        body = getattr(page, "body", None)
+        if body:
+            for block_image_id in get_stream_image_ids(body):
+                add(block_image_id, IMAGE_BLOCK_FILTER_SPEC)
+
+        if isinstance(page, HomePage):
+            add(page.promo_image_id, PROMO_FILTER_SPEC)
+            for field, spec in FEATURED_SECTION_FILTER_SPECS.items():
+                section = getattr(page, field)
+                if section is None:
+                    continue
+                for child in section.get_children().live().specific():
+                    add(getattr(child, "image_id", None), spec)
+
+    gallery_images = Image.objects.filter(
+        collection__in=GalleryPage.objects.live().values("collection")
+    )
+    people = People.objects.all()
+    if changed_since:
+        gallery_images = gallery_images.filter(created_at__gte=changed_since)
+        people = people.filter(image__created_at__gte=changed_since)
+
+    for image_id in gallery_images.values_list("pk", flat=True).iterator():
+        add(image_id, GALLERY_FILTER_SPEC)
+    for image_id in people.values_list("image_id", flat=True).iterator():
+        add(image_id, PERSON_THUMB_FILTER_SPEC, responsive=False)
+
+    return renditions
+
+
+def find_missing_renditions(renditions):
+    """
+    Filters the output of collect_renditions() down to the renditions that
+    haven't been generated yet, using one query for all existing renditions.
+    """
+    Rendition = Image.get_rendition_model()
+    specs = set().union(*renditions.values()) if renditions else set()
+    existing = set(
+        Rendition.objects.filter(
+            image_id__in=renditions.keys(), filter_spec__in=specs
+        ).values_list("image_id", "filter_spec", "focal_point_key")
+    )
+
+    missing = {}
+    for image in Image.objects.filter(pk__in=renditions.keys()).iterator():
+        for spec in renditions[image.pk]:
+            focal_point_key = Filter(spec=spec).get_cache_key(image)
+            if (image.pk, spec, focal_point_key) not in existing:
+                missing.setdefault(image.pk, set()).add(spec)
+    return missing
+
+
+def generate_renditions(image_id, specs):
+    """
+    Generates the given renditions of one image. Runs in worker processes,
+    so it only takes and returns plain values. Returns the number of
+    renditions generated and the number that failed.
+    """
+    try:
+        with transaction.atomic():
+            get_renditions(Image.objects.get(pk=image_id), specs)
+    except Exception:
+        logger.exception("Failed to generate renditions for image %d", image_id)
+        return 0, len(specs)
+    return len(specs), 0
+
+
+def enqueue_renditions(renditions):
+    """
+    Queues (image ID, filter spec) pairs for the `process_rendition_queue`
+    worker. Pairs that are already queued, or failed, are left as they are.
+    """
+    from apps.base.models import RenditionQueueEntry
+
+    if not renditions:
+        return
+    RenditionQueueEntry.objects.bulk_create(
+        [
+            RenditionQueueEntry(image_id=image_id, filter_spec=spec)
+            for image_id, spec in renditions
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def find_failed_renditions(renditions):
+    """
+    Returns the set of the given (image ID, filter spec) pairs that the
+    `process_rendition_queue` worker failed to generate.
+    """
+    from apps.base.models import RenditionQueueEntry
+
+    renditions = set(renditions)
+    failed = RenditionQueueEntry.objects.filter(
+        failed=True,
+        image_id__in={image_id for image_id, _ in renditions},
+        filter_spec__in={spec for _, spec in renditions},
+    ).values_list("image_id", "filter_spec")
+    return set(failed) & renditions
+
+
+def process_queue(batch_size=100):
+    """
+    Generates the oldest `batch_size` queued renditions, grouped by image so
+    that each source file is decoded once. Failures are logged, and their
+    entries marked as failed rather than removed, so that requests neither
+    queue them again nor wait for them. Returns the number of entries
+    processed.
+    """
+    from apps.base.models import RenditionQueueEntry
+
+    with transaction.atomic():
+        # Entries claimed by another worker are skipped, and stay locked
+        # until their renditions are generated
+        entries = list(
+            RenditionQueueEntry.objects.select_for_update(skip_locked=True)
+            .filter(failed=False)
+            .order_by("queued_at")[:batch_size]
+        )
+        if not entries:
+            return 0
+
+        specs_by_image = {}
+        for entry in entries:
+            specs_by_image.setdefault(entry.image_id, set()).add(entry.filter_spec)
+        failed = 0
+        failed_images = set()
+        for image_id, specs in specs_by_image.items():
+            if generate_renditions(image_id, sorted(specs))[1]:
+                failed += len(specs)
+                failed_images.add(image_id)
+
+        processed = RenditionQueueEntry.objects.filter(
+            pk__in=[entry.pk for entry in entries]
+        )
+        processed.filter(image_id__in=failed_images).update(failed=True)
+        processed.exclude(image_id__in=failed_images).delete()
+
+    logger.info("Processed %d queued renditions, %d failed", len(entries), failed)
+    return len(entries)
+
+
+class DecodedSource:
+    """
+    Stands in for the Willow image that `Filter.run()` opens from the source
+    file, handing out an already decoded and oriented copy instead. Willow
+    operations return new images, so the copy can be shared between filters.
+    """
+
+    def __init__(self, willow, format_name):
+        self.willow = willow
+        self.format_name = format_name
+
+    def auto_orient(self):
+        return self.willow
+
+
+@contextmanager
+def decoded_source(image):
+    with image.get_willow_image() as willow:
+        yield DecodedSource(willow.auto_orient(), willow.format_name)
+
+
+def get_renditions(image, specs):
+    """
+    Returns a dict of filter spec to rendition for one image. Existing
+    renditions are looked up in one query (unless they were prefetched), and
+    all missing ones are generated from a single read and decode of the
+    source file.
+    """
+    Rendition = image.get_rendition_model()
+    if not hasattr(image, "prefetched_renditions"):
+        image.prefetched_renditions = list(
+            image.renditions.filter(filter_spec__in=specs)
+        )
+
+    renditions = {}
+    missing = []
+    for spec in specs:
+        try:
+            renditions[spec] = image.find_existing_rendition(Filter(spec=spec))
+        except Rendition.DoesNotExist:
+            missing.append(Filter(spec=spec))
+
+    if missing:
+        with decoded_source(image) as source:
+            image.get_willow_image = lambda: nullcontext(source)
+            try:
+                created = [image.create_rendition(filter) for filter in missing]
+            finally:
+                del image.get_willow_image
+        # get_rendition() finds them among the prefetched renditions, and
+        # puts them in the renditions cache now that the image pickles again
+        image.prefetched_renditions += created
+        for filter in missing:
+            renditions[filter.spec] = image.get_rendition(filter)
+    return renditions
+
+
+# Scales at which responsive variants of each filter spec are generated, so
+# that small screens download smaller files
+RESPONSIVE_SCALES = (0.5, 0.75, 1)
+RESIZE_SPEC_RE = re.compile(
+    r"^(fill|max|min)-(\d+)x(\d+)(-c\d+)?$|^(width|height)-(\d+)$"
+)
+
+
+def scale_spec(spec, scale):
+    """
+    Scales the resize operation at the start of a filter spec, e.g.
+    "fill-645x480-c100" at 0.5 is "fill-323x240-c100". Specs that don't
+    start with a resize operation are returned unchanged.
+    """
+    resize, _, rest = spec.partition("|")
+    match = RESIZE_SPEC_RE.match(resize)
+    if not match:
+        return spec
+    if match.group(1):
+        operation, width, height, crop = match.group(1, 2, 3, 4)
+        resize = "{}-{}x{}{}".format(
+            operation,
+            round(int(width) * scale),
+            round(int(height) * scale),
+            crop or "",
+        )
+    else:
+        operation, size = match.group(5, 6)
+        resize = "{}-{}".format(operation, round(int(size) * scale))
+    return "|".join(part for part in (resize, rest) if part)
+
+
+def responsive_specs(spec):
+    """
+    Returns the (fallback, webp) pairs of filter specs for every responsive
+    scale of `spec`, largest last.
+    """
+    specs = []
+    for scale in RESPONSIVE_SCALES:
+        scaled = scale_spec(spec, scale)
+        pair = (scaled, scaled + "|format-webp")
+        if pair not in specs:
+            specs.append(pair)
+    return specs
+
+
+def all_responsive_specs(spec):
+    return [variant for pair in responsive_specs(spec) for variant in pair]
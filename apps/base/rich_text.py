@@ -0,0 +1,223 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.html import escape
+
+from wagtail.documents import get_document_model
+from wagtail.documents.rich_text import DocumentLinkHandler
+from wagtail.fields import RichTextField, StreamField
+from wagtail.images import get_image_model
+from wagtail.images.formats import get_image_format
+from wagtail.images.rich_text import ImageEmbedHandler
+from wagtail.models import Locale, Page
+from wagtail.rich_text.pages import PageLinkHandler
+from wagtail.rich_text.rewriters import (
+    FIND_A_TAG,
+    FIND_EMBED_TAG,
+    extract_attrs,
+)
+
+from apps.base.models import FooterText
+from apps.base.navigation import chrome_cache_key
+
+# The references of the request being handled, see RichTextReferences
+current_references = ContextVar("rich_text_references", default=None)
+
+
+def parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RichTextReferences:
+    """
+    Request-scoped map of the pages, documents and images linked from rich
+    text. References are collected from the raw HTML up front with `add()`,
+    and every pending reference of a type is resolved in one bulk query the
+    first time a link of that type is rendered. References nobody collected
+    are resolved the same way when they're first rendered, and kept for the
+    rest of the request.
+    """
+
+    def __init__(self, request=None):
+        # Page URLs are worked out against the request's site, like
+        # {% pageurl %}, which also reuses the site root paths it caches
+        self.request = request
+        self.page_urls = {}
+        self.document_urls = {}
+        self.images = {}
+        self.pending_pages = set()
+        self.pending_documents = set()
+        self.pending_images = set()
+        self.image_specs = set()
+
+    def add(self, html):
+        for match in FIND_A_TAG.finditer(html):
+            attrs = extract_attrs(match.group(1))
+            pk = parse_id(attrs.get("id"))
+            if attrs.get("linktype") == "page" and pk not in self.page_urls:
+                self.pending_pages.add(pk)
+            elif attrs.get("linktype") == "document" and pk not in self.document_urls:
+                self.pending_documents.add(pk)
+        for match in FIND_EMBED_TAG.finditer(html):
+            attrs = extract_attrs(match.group(1))
+            pk = parse_id(attrs.get("id"))
+            if attrs.get("embedtype") == "image" and pk not in self.images:
+                self.pending_images.add(pk)
+                try:
+                    self.image_specs.add(get_image_format(attrs["format"]).filter_spec)
+                except KeyError:
+                    pass
+
+    def get_page_url(self, pk):
+        if pk not in self.page_urls:
+            self.pending_pages.add(pk)
+            self.load_pages()
+        return self.page_urls[pk]
+
+    def get_document_url(self, pk):
+        if pk not in self.document_urls:
+            self.pending_documents.add(pk)
+            self.load_documents()
+        return self.document_urls[pk]
+
+    def get_image(self, pk, filter_spec):
+        if pk not in self.images:
+            self.pending_images.add(pk)
+            self.image_specs.add(filter_spec)
+            self.load_images()
+        return self.images[pk]
+
+    def load_pages(self):
+        pks, self.pending_pages = self.pending_pages - {None}, set()
+        pages = Page.objects.filter(pk__in=pks).in_bulk()
+
+        # Same as Page.localized: link to the live translation in the active
+        # locale, if there is one
+        translations = {}
+        if getattr(settings, "WAGTAIL_I18N_ENABLED", False):
+            locale = Locale.get_active()
+            translation_keys = [
+                page.translation_key
+                for page in pages.values()
+                if page.locale_id != locale.pk
+            ]
+            if translation_keys:
+                translations = {
+                    page.translation_key: page
+                    for page in Page.objects.live().filter(
+                        translation_key__in=translation_keys, locale=locale
+                    )
+                }
+
+        self.page_urls[None] = None
+        for pk in pks:
+            page = pages.get(pk)
+            if page is not None:
+                page = translations.get(page.translation_key, page)
+            self.page_urls[pk] = (
+                page.get_url(self.request) if page is not None else None
+            )
+
+    def load_documents(self):
+        pks, self.pending_documents = self.pending_documents - {None}, set()
+        documents = get_document_model().objects.in_bulk(pks)
+        self.document_urls[None] = None
+        for pk in pks:
+            document = documents.get(pk)
+            self.document_urls[pk] = document.url if document is not None else None
+
+    def load_images(self):
+        pks, self.pending_images = self.pending_images - {None}, set()
+        images = (
+            get_image_model()
+            .objects.filter(pk__in=pks)
+            .prefetch_renditions(*self.image_specs)
+            .in_bulk()
+        )
+        self.images[None] = None
+        for pk in pks:
+            self.images[pk] = images.get(pk)
+
+
+def collect_page_references(page):
+    """
+    Adds the rich text of a page's RichTextFields and StreamFields to the
+    current request's references, before anything is rendered.
+    """
+    references = current_references.get()
+    if references is None:
+        return
+
+    def walk(value):
+        if isinstance(value, str):
+            if "linktype=" in value or "embedtype=" in value:
+                references.add(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    for field in page._meta.get_fields():
+        if isinstance(field, RichTextField):
+            walk(getattr(page, field.name) or "")
+        elif isinstance(field, StreamField):
+            walk(list(getattr(page, field.name).raw_data))
+
+
+def collect_footer_references(request):
+    """
+    Adds the footer's rich text to the current request's references, unless
+    the cached footer fragment will be served instead of rendering it.
+    """
+    references = current_references.get()
+    if references is None or chrome_cache_key("footer", request) in cache:
+        return
+
+    footer_text = FooterText.objects.first()
+    if footer_text:
+        references.add(footer_text.body)
+
+
+# Front-end handlers resolving references through the current request's
+# map; outside a request they fall back to Wagtail's one query per link
+
+
+class BatchedPageLinkHandler(PageLinkHandler):
+    @classmethod
+    def expand_db_attributes(cls, attrs):
+        references = current_references.get()
+        if references is None:
+            return super().expand_db_attributes(attrs)
+        url = references.get_page_url(parse_id(attrs.get("id")))
+        return '<a href="%s">' % escape(url) if url is not None else "<a>"
+
+
+class BatchedDocumentLinkHandler(DocumentLinkHandler):
+    @classmethod
+    def expand_db_attributes(cls, attrs):
+        references = current_references.get()
+        if references is None:
+            return super().expand_db_attributes(attrs)
+        url = references.get_document_url(parse_id(attrs.get("id")))
+        return '<a href="%s">' % escape(url) if url is not None else "<a>"
+
+
+class BatchedImageEmbedHandler(ImageEmbedHandler):
+    @classmethod
+    def expand_db_attributes(cls, attrs):
+        references = current_references.get()
+        if references is None:
+            return super().expand_db_attributes(attrs)
+        image_format = get_image_format(attrs["format"])
+        image = references.get_image(
+            parse_id(attrs.get("id")), image_format.filter_spec
+        )
+        if image is None:
+            return '<img alt="">'
+        return image_format.image_to_html(image, attrs.get("alt", ""))
@@ -0,0 +1,172 @@
+"""
+SENDFILE_BACKEND for Wagtail's document serve view, also used to serve
+image originals from MEDIA_ROOT.
+
+By default files are returned as a FileResponse, which gunicorn sends with
+os.sendfile() so the content never passes through the worker. Setting
+SENDFILE_OFFLOAD to "x-accel-redirect" (nginx) or "x-sendfile" (Apache,
+lighttpd) hands the file over to the proxy instead.
+
+Range and conditional requests are answered here in the first mode, and
+by the proxy when offloading. Wagtail's sendfile() wrapper overwrites some
+headers with those of the whole file, so documents are served by
+apps.base.views.serve_document, which sets them back.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Headers wagtail.utils.sendfile.sendfile() sets after the backend returns
+WRAPPER_HEADERS = ("Content-Length", "Content-Type", "Content-Encoding")
+
+
+class FileRange:
+    """
+    A file limited to `length` bytes from its current position. Exposes
+    fileno() so gunicorn can still use os.sendfile(), which sends exactly
+    Content-Length bytes; other servers fall back to read().
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Returns the (start, end) of a single byte range, inclusive, or None to
+    send the whole file. Requests for several ranges get the whole file,
+    which is valid.
+    """
+    match = RANGE_RE.match(header or "")
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if not start:
+        # A suffix range: the last `end` bytes
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start > end:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def content_disposition(filename, attachment):
+    # The same header as FileResponse's
+    disposition = "attachment" if attachment else "inline"
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        return "{}; filename*=utf-8''{}".format(disposition, quote(filename))
+    return '{}; filename="{}"'.format(
+        disposition, filename.replace("\\", "\\\\").replace('"', r"\"")
+    )
+
+
+def restore_headers(response):
+    """
+    Sets back the headers of a response from sendfile() that Wagtail's
+    wrapper overwrote, e.g. the Content-Length of a range.
+    """
+    headers = getattr(response, "sendfile_headers", None)
+    if headers is None:
+        return response
+    for header in WRAPPER_HEADERS:
+        if header in headers:
+            response[header] = headers[header]
+        elif header in response:
+            del response[header]
+    return response
+
+
+def offload(filename, mimetype):
+    offload = getattr(settings, "SENDFILE_OFFLOAD", None)
+    response = HttpResponse(content_type=mimetype)
+    if offload == "x-accel-redirect":
+        # An nginx `internal` location must map SENDFILE_URL to MEDIA_ROOT
+        path = os.path.relpath(filename, settings.MEDIA_ROOT)
+        response["X-Accel-Redirect"] = quote(
+            settings.SENDFILE_URL + path.replace(os.sep, "/")
+        )
+    else:
+        response["X-Sendfile"] = filename
+    return response
+
+
+def sendfile(
+    request, filename, mimetype=None, attachment=False, attachment_filename=None
+):
+    response = get_response(request, filename, mimetype)
+    if response.status_code in (200, 206) and (attachment or attachment_filename):
+        response["Content-Disposition"] = content_disposition(
+            attachment_filename or os.path.basename(filename), attachment
+        )
+    response.sendfile_headers = {
+        header: response[header] for header in WRAPPER_HEADERS if header in response
+    }
+    return response
+
+
+def get_response(request, filename, mimetype):
+    if getattr(settings, "SENDFILE_OFFLOAD", None):
+        return offload(filename, mimetype)
+
+    stat = os.stat(filename)
+    mtime, size = int(stat.st_mtime), stat.st_size
+    etag = '"{:x}-{:x}"'.format(mtime, size)
+
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is not None:
+        return response
+
+    try:
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = "bytes */{}".format(size)
+        return response
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != mtime:
+        # The client's partial copy is of another version: send it all
+        byte_range = None
+
+    file = open(filename, "rb")
+    if byte_range:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(FileRange(file, end - start + 1), status=206)
+        response["Content-Range"] = "bytes {}-{}/{}".format(start, end, size)
+        response["Content-Length"] = end - start + 1
+    else:
+        response = FileResponse(file)
+        response["Content-Length"] = size
+    response["Content-Type"] = mimetype
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    return response
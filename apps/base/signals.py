@@ -0,0 +1,160 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.images import get_image_model
+from wagtail.models import Page, PageLogEntry
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from apps.base import page_cache, sitemaps
+from apps.base.cache import bump_generation
+from apps.base.embeds import prefetch_embeds
+from apps.base.models import (
+    FooterText,
+    People,
+    RenditionQueueEntry,
+    StaffDirectoryPage,
+)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+def page_tree_changed(sender, instance, **kwargs):
+    # Menu trees and the header and breadcrumb fragments are cached per site
+    # and locale; publishing, unpublishing or moving any page may change
+    # titles, URLs or `show_in_menus`
+    bump_generation("navigation")
+
+
+def get_previous_live_revision(page):
+    """
+    Returns the revision that was live before the one being published, or
+    None if the page wasn't live. Wagtail logs a publication after sending
+    page_published, so the latest entry is still the previous one.
+    """
+    entry = (
+        PageLogEntry.objects.filter(
+            page=page,
+            action__in=[
+                "wagtail.publish",
+                "wagtail.publish.scheduled",
+                "wagtail.unpublish",
+                "wagtail.unpublish.scheduled",
+            ],
+        )
+        .select_related("revision")
+        .order_by("-timestamp", "-pk")
+        .first()
+    )
+    if entry is None or entry.action.startswith("wagtail.unpublish"):
+        return None
+    return entry.revision
+
+
+def slug_changed(page):
+    # Whether publishing changes the page's URL, and those of its descendants
+    previous = get_previous_live_revision(page)
+    return previous is not None and previous.content.get("slug") != page.slug
+
+
+@receiver(page_published)
+def page_published_purge(sender, instance, **kwargs):
+    previous = get_previous_live_revision(instance)
+    if previous is None:
+        # The page just went live, and joins the menu if it is shown there
+        changed_everywhere = instance.show_in_menus
+    else:
+        old = previous.content
+        changed_everywhere = (
+            # The page joined or left the menu on every page, or was renamed
+            # in it
+            old.get("show_in_menus") != instance.show_in_menus
+            or (instance.show_in_menus and old.get("title") != instance.title)
+            # Links to the page and its descendants from any page change
+            or old.get("slug") != instance.slug
+        )
+    if changed_everywhere:
+        page_cache.purge_all()
+        return
+    # Purge the responses built from this page, and those listing its
+    # siblings through the parent (e.g. featured sections on the home page)
+    parent = instance.get_parent()
+    page_cache.purge_pages([instance.pk] + ([parent.pk] if parent else []))
+
+
+@receiver(page_published)
+def page_published_embeds(sender, instance, **kwargs):
+    # Embeds are only ever fetched here, rendering reads the stored ones
+    prefetch_embeds(instance)
+
+
+@receiver(page_unpublished)
+@receiver(post_page_move)
+def page_structure_changed(sender, instance, **kwargs):
+    # Removing or moving a page can break links on any cached response
+    page_cache.purge_all()
+
+
+@receiver(post_delete)
+def page_deleted(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        page_tree_changed(sender, instance)
+        page_structure_changed(sender, instance)
+        featured_content_changed(sender, instance)
+        sitemap_page_changed(sender, instance)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def featured_content_changed(sender, instance, **kwargs):
+    # HomePage.get_featured_content() and rendered StreamFields are cached on
+    # these generations; they embed page URLs and image renditions
+    bump_generation("homepage")
+    bump_generation("stream")
+
+
+@receiver(page_unpublished)
+def sitemap_page_changed(sender, instance, **kwargs):
+    sitemaps.pages_changed([(instance.pk, instance.locale_id)])
+
+
+@receiver(page_published)
+def sitemap_page_published(sender, instance, **kwargs):
+    if slug_changed(instance):
+        sitemap_page_moved(sender, instance)
+    else:
+        sitemap_page_changed(sender, instance)
+
+
+@receiver(post_page_move)
+def sitemap_page_moved(sender, instance, **kwargs):
+    # Moving a page changes the URLs of everything below it
+    sitemaps.pages_changed(
+        instance.get_descendants(inclusive=True).values_list("pk", "locale_id")
+    )
+
+
+@receiver(post_save, sender=FooterText)
+@receiver(post_delete, sender=FooterText)
+def footer_text_changed(sender, instance, **kwargs):
+    bump_generation("footer")
+
+
+@receiver(post_save, sender=People)
+@receiver(post_delete, sender=People)
+def people_changed(sender, instance, **kwargs):
+    # Any page of the staff directory may list the person
+    page_cache.purge_pages(StaffDirectoryPage.objects.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=get_image_model())
+def image_changed_renditions(sender, instance, **kwargs):
+    # A new file or focal point may fix renditions that failed before. They
+    # are queued again the next time they are requested, so directory pages
+    # cached without them are purged
+    failed = RenditionQueueEntry.objects.filter(image=instance, failed=True)
+    if failed.delete()[0]:
+        people_changed(sender, instance)
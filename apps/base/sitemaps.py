@@ -0,0 +1,143 @@
+import gzip
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from wagtail.models import Locale, Page
+
+from apps.base.cache import CACHE_TIMEOUT, bump_generation, get_generation
+
+# The sitemap is split into one shard per locale and range of page IDs, so
+# publishing a page only regenerates the shard it is in. A range of page
+# IDs, rather than a page count, keeps a page in the same shard for good.
+
+
+def get_shard(page_id):
+    return page_id // settings.SITEMAP_SHARD_SIZE
+
+
+def shard_generation(locale_id, shard):
+    return "sitemap:{}:{}".format(locale_id, shard)
+
+
+def get_sitemap_pages(site, locale):
+    root = site.root_page.get_translation_or_none(locale)
+    if root is None:
+        return Page.objects.none()
+    return root.get_descendants(inclusive=True).live().public()
+
+
+def build_index(site):
+    """
+    Lists the shards of every locale with their last modification, from
+    one grouped query per locale.
+    """
+    shards = []
+    for locale in Locale.objects.all():
+        rows = (
+            get_sitemap_pages(site, locale)
+            # Integer division on both PostgreSQL and SQLite, see get_shard()
+            .annotate(shard=F("pk") / settings.SITEMAP_SHARD_SIZE)
+            .values("shard")
+            .annotate(
+                last_mod=Max(
+                    Coalesce("last_published_at", "latest_revision_created_at")
+                )
+            )
+            .order_by("shard")
+        )
+        for row in rows:
+            url = reverse("sitemap_shard", args=[locale.language_code, row["shard"]])
+            shards.append(
+                {"location": site.root_url + url, "last_mod": row["last_mod"]}
+            )
+    content = render_to_string("sitemap_index.xml", {"sitemaps": shards})
+    last_modified = max(
+        (shard["last_mod"] for shard in shards if shard["last_mod"]), default=None
+    )
+    return content, last_modified
+
+
+def build_shard(request, site, locale, shard):
+    size = settings.SITEMAP_SHARD_SIZE
+    pages = (
+        get_sitemap_pages(site, locale)
+        .filter(pk__gte=shard * size, pk__lt=(shard + 1) * size)
+        .order_by("path")
+        .defer_streamfields()
+        .specific()
+    )
+    urls = [url for page in pages for url in page.get_sitemap_urls(request)]
+    if not urls:
+        return None, None
+    content = render_to_string("sitemap.xml", {"urlset": urls})
+    last_modified = max(
+        (url["lastmod"] for url in urls if url.get("lastmod")), default=None
+    )
+    return content, last_modified
+
+
+def get_stored(key, build):
+    """
+    Returns the gzip-compressed XML and last modification stored under
+    `key`, building it on a miss. Both are None when there is nothing to
+    list.
+    """
+    stored = cache.get(key)
+    if stored is None:
+        content, last_modified = build()
+        if content is not None:
+            content = gzip.compress(content.encode("utf-8"))
+        stored = (content, last_modified)
+        cache.set(key, stored, CACHE_TIMEOUT)
+    return stored
+
+
+def get_index(site):
+    key = "sitemap:index:{}:{}".format(get_generation("sitemap"), site.pk)
+    return get_stored(key, lambda: build_index(site))
+
+
+def get_shard_sitemap(request, site, locale, shard):
+    key = "sitemap:shard:{}:{}:{}:{}".format(
+        get_generation(shard_generation(locale.pk, shard)), site.pk, locale.pk, shard
+    )
+    return get_stored(key, lambda: build_shard(request, site, locale, shard))
+
+
+def sitemap_response(request, content, last_modified):
+    """
+    Serves stored XML as is to clients accepting gzip, answering conditional
+    requests from the stored last modification.
+    """
+    if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+        response = HttpResponse(content, content_type="application/xml")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(
+            gzip.decompress(content), content_type="application/xml"
+        )
+    patch_vary_headers(response, ["Accept-Encoding"])
+    if last_modified is None:
+        return response
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    return get_conditional_response(
+        request, last_modified=int(last_modified.timestamp()), response=response
+    )
+
+
+def pages_changed(pages):
+    """
+    Marks the shards holding the given pages, given as (pk, locale_id) pairs,
+    and the index for regeneration.
+    """
+    for locale_id, shard in {(locale_id, get_shard(pk)) for pk, locale_id in pages}:
+        bump_generation(shard_generation(locale_id, shard))
+    bump_generation("sitemap")
@@ -0,0 +1,269 @@
+import gzip
+import mimetypes
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+import brotli
+
+# Text formats worth compressing; images and fonts such as .woff2 are
+# compressed already
+COMPRESSIBLE_EXTENSIONS = {
+    ".css",
+    ".js",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+    ".json",
+    ".html",
+    ".eot",
+    ".ttf",
+    ".otf",
+}
+COMPRESS_MIN_SIZE = 256
+
+# Encodings in order of preference, with the suffix of their variant
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+# Names with a ManifestStaticFilesStorage hash, e.g. main.4f3c2a1b9d8e.css
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+
+
+def parse_accept_encoding(header):
+    """
+    Returns a dict of the encodings listed in an Accept-Encoding header to
+    their q-values, e.g. "gzip, br;q=0" is {"gzip": 1.0, "br": 0.0}.
+    """
+    encodings = {}
+    for item in header.split(","):
+        encoding, *params = [part.strip() for part in item.split(";")]
+        if not encoding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[encoding.lower()] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding, available):
+    """
+    Returns the encoding of the variant to send, None for the original:
+    the one the client gives the highest q-value, preferring the order of
+    ENCODINGS on ties. Encodings with q=0 are refused.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding, _ in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def read_chunks(path, chunk_size=64 * 1024):
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(chunk_size), b"")
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes gzip and brotli variants of
+    text files at collectstatic time, for StaticFilesApp to serve.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        compressed = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            yield name, hashed_name, processed
+            if dry_run or isinstance(processed, Exception):
+                continue
+            for path in (name, hashed_name):
+                if path and path not in compressed:
+                    compressed.add(path)
+                    self.compress(path)
+
+    def compress(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+
+        variants = [
+            (".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+            (".br", brotli.compress(content)),
+        ]
+        for suffix, data in variants:
+            # Variants no smaller than the original aren't worth serving
+            if len(data) < len(content):
+                with open(self.path(name + suffix), "wb") as f:
+                    f.write(data)
+
+
+class StaticFiles:
+    """
+    Serves STATIC_ROOT in front of Django, so static requests never reach
+    the URL resolver. Files are indexed once at startup (collectstatic runs
+    before the server starts), and the best precompressed variant the
+    client accepts is served with `Vary: Accept-Encoding`. Hashed names are
+    cached as immutable. Requests for files that aren't in STATIC_ROOT pass
+    through to Django.
+
+    This holds the index and the HTTP logic; StaticFilesApp and
+    AsgiStaticFilesApp adapt it to WSGI and ASGI.
+    """
+
+    def __init__(self, root, prefix):
+        self.prefix = prefix
+        self.files = self.index(root) if root and os.path.isdir(root) else {}
+
+    def index(self, root):
+        files = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                variant = None
+                for encoding, suffix in ENCODINGS:
+                    if name.endswith(suffix):
+                        name, variant = name[: -len(suffix)], encoding
+                        break
+                stat = os.stat(path)
+                files.setdefault(self.prefix + name, {})[variant] = (
+                    path,
+                    stat.st_size,
+                    int(stat.st_mtime),
+                )
+        # Drop variants whose original file is missing
+        return {url: variants for url, variants in files.items() if None in variants}
+
+    def get(self, method, url, accept_encoding, if_modified_since):
+        """
+        Returns the status, headers and file to send (None for no body), or
+        None if the request should go to Django.
+        """
+        variants = self.files.get(url)
+        if variants is None or method not in ("GET", "HEAD"):
+            return None
+
+        encoding = choose_encoding(accept_encoding, variants)
+        path, size, mtime = variants[encoding]
+
+        headers = [
+            (
+                "Content-Type",
+                mimetypes.guess_type(url)[0] or "application/octet-stream",
+            ),
+            ("Last-Modified", formatdate(mtime, usegmt=True)),
+        ]
+        if len(variants) > 1:
+            headers.append(("Vary", "Accept-Encoding"))
+        if HASHED_NAME_RE.search(url):
+            headers.append(("Cache-Control", "public, max-age=31536000, immutable"))
+        else:
+            headers.append(("Cache-Control", "public, max-age=60"))
+
+        if self.not_modified(if_modified_since, mtime):
+            return "304 Not Modified", headers, None
+
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+        headers.append(("Content-Length", str(size)))
+        return "200 OK", headers, path if method == "GET" else None
+
+    def not_modified(self, if_modified_since, mtime):
+        if not if_modified_since:
+            return False
+        try:
+            return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+
+class StaticFilesApp:
+    """
+    WSGI middleware serving StaticFiles, see config/wsgi.py.
+    """
+
+    def __init__(self, application, root, prefix):
+        self.application = application
+        self.static_files = StaticFiles(root, prefix)
+
+    def __call__(self, environ, start_response):
+        result = self.static_files.get(
+            environ["REQUEST_METHOD"],
+            environ.get("PATH_INFO", ""),
+            environ.get("HTTP_ACCEPT_ENCODING", ""),
+            environ.get("HTTP_IF_MODIFIED_SINCE"),
+        )
+        if result is None:
+            return self.application(environ, start_response)
+
+        status, headers, path = result
+        start_response(status, headers)
+        if path is None:
+            return []
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if file_wrapper is not None:
+            return file_wrapper(open(path, "rb"))
+        return read_chunks(path)
+
+
+class AsgiStaticFilesApp:
+    """
+    ASGI middleware serving StaticFiles, see config/asgi.py.
+    """
+
+    def __init__(self, application, root, prefix):
+        self.application = application
+        self.static_files = StaticFiles(root, prefix)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.application(scope, receive, send)
+        request_headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        result = self.static_files.get(
+            scope["method"],
+            scope["path"],
+            request_headers.get("accept-encoding", ""),
+            request_headers.get("if-modified-since"),
+        )
+        if result is None:
+            return await self.application(scope, receive, send)
+
+        status, headers, path = result
+        await send(
+            {
+                "type": "http.response.start",
+                "status": int(status.split()[0]),
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            }
+        )
+        if path is None:
+            await send({"type": "http.response.body"})
+            return
+        # Static files are small, and reading them from the page cache
+        # doesn't block for long; they're sent in chunks all the same
+        for chunk in read_chunks(path):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body"})
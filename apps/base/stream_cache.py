@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from apps.base.cache import CACHE_TIMEOUT, get_generation
+
+
+def is_cacheable_block(block):
+    """
+    Whether a block's output depends only on its value. Blocks whose output
+    depends on the request opt out with `cache_render = False` in their Meta
+    (or as a keyword argument); this also applies to any block nesting them.
+    """
+    if not getattr(block.meta, "cache_render", True):
+        return False
+    children = list(getattr(block, "child_blocks", {}).values())
+    if hasattr(block, "child_block"):
+        children.append(block.child_block)
+    return all(is_cacheable_block(child) for child in children)
+
+
+def render_child(child, context=None):
+    # Same markup as StreamBlock.render_basic()
+    return format_html(
+        '<div class="block-{1}">{0}</div>',
+        child.render(context=context),
+        child.block_type,
+    )
+
+
+def stream_cache_key(page, field_name):
+    # A new revision is saved whenever the body can change; the "stream"
+    # generation covers the pages and images the body links to
+    return "stream:{}:{}:{}:{}:{}:{}".format(
+        get_generation("stream"),
+        page.pk,
+        page.live_revision_id or page.latest_revision_id,
+        field_name,
+        page.locale_id,
+        get_language(),
+    )
+
+
+def render_stream(page, field_name, context=None):
+    """
+    Renders a StreamField of a page, memoized per page revision in the shared
+    cache. The rendered blocks are stored as a list of HTML strings, with
+    None in place of blocks that opt out of caching, which are rendered
+    with the template context on every request.
+    """
+    stream_value = getattr(page, field_name)
+    key = stream_cache_key(page, field_name)
+    parts = cache.get(key)
+    # The length check guards against bodies changed without a new revision
+    if parts is None or len(parts) != len(stream_value):
+        parts = [
+            str(render_child(child)) if is_cacheable_block(child.block) else None
+            for child in stream_value
+        ]
+        cache.set(key, parts, CACHE_TIMEOUT)
+
+    return mark_safe(
+        "\n".join(
+            part if part is not None else render_child(child, context)
+            for part, child in zip(parts, stream_value)
+        )
+    )
@@ -0,0 +1,162 @@
+import logging
+from datetime import timedelta
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from wagtail.contrib.forms.models import FormSubmission
+
+from apps.base.models import FormPage, QueuedSubmission
+
+logger = logging.getLogger(__name__)
+
+# Claimed entries are left to the worker that claimed them for this long
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def get_retry_delay(attempts):
+    # Exponential backoff: 1, 2, 4... times the base delay, capped at a day
+    delay = settings.FORM_EMAIL_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, 60 * 60 * 24))
+
+
+def claim_entries(batch_size):
+    """
+    Claims the oldest `batch_size` due entries. Rows another worker is
+    claiming are skipped, and claimed entries aren't due again until
+    CLAIM_TIMEOUT has passed, so several workers can share the queue
+    without saving or emailing a submission twice.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            QueuedSubmission.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        QueuedSubmission.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            next_attempt_at=now + CLAIM_TIMEOUT
+        )
+    return entries
+
+
+def save_submissions(entries):
+    """
+    Saves a FormSubmission for each entry that doesn't have one yet, in one
+    insert.
+    """
+    new = [entry for entry in entries if entry.submission_id is None]
+    if not new:
+        return
+    # Entries keep their submission, or neither is saved
+    with transaction.atomic():
+        submissions = FormSubmission.objects.bulk_create(
+            [
+                FormSubmission(page_id=entry.page_id, form_data=entry.form_data)
+                for entry in new
+            ]
+        )
+        for entry, submission in zip(new, submissions):
+            entry.submission = submission
+        QueuedSubmission.objects.bulk_update(new, ["submission"])
+
+
+def decode_form_data(form, form_data):
+    # Dates are stored as ISO strings; render_email() only formats date and
+    # datetime objects
+    cleaned_data = dict(form_data)
+    for name, field in form.fields.items():
+        if name in cleaned_data and isinstance(
+            field, (forms.DateField, forms.DateTimeField)
+        ):
+            try:
+                cleaned_data[name] = field.to_python(cleaned_data[name])
+            except ValidationError:
+                pass
+    return cleaned_data
+
+
+def build_email(page, entry):
+    # The same email as AbstractEmailForm.send_mail(), from the stored data
+    form = page.get_form(page=page, user=None)
+    form.cleaned_data = decode_form_data(form, entry.form_data)
+    return EmailMessage(
+        page.subject,
+        page.render_email(form),
+        page.from_address
+        or getattr(settings, "WAGTAILADMIN_NOTIFICATION_FROM_EMAIL", None)
+        or settings.DEFAULT_FROM_EMAIL,
+        [address.strip() for address in page.to_address.split(",")],
+        headers={"Auto-Submitted": "auto-generated"},
+    )
+
+
+def send_emails(pages, entries):
+    """
+    Sends the emails of the given entries over one connection, and returns
+    the entries that failed with their error.
+    """
+    failed = []
+    connection = get_connection()
+    try:
+        connection.open()
+        for entry in entries:
+            try:
+                connection.send_messages([build_email(pages[entry.page_id], entry)])
+            except Exception as e:
+                failed.append((entry, e))
+    except Exception as e:
+        # No connection at all: every email is retried
+        failed = [(entry, e) for entry in entries]
+    finally:
+        connection.close()
+    return failed
+
+
+def process_queue(batch_size=100):
+    """
+    Saves the oldest `batch_size` due submissions and sends their emails.
+    Failed emails are retried with exponential backoff, and given up on
+    after FORM_EMAIL_MAX_ATTEMPTS; the submission itself is kept either
+    way. Returns the number of entries processed.
+    """
+    entries = claim_entries(batch_size)
+    if not entries:
+        return 0
+
+    save_submissions(entries)
+
+    pages = FormPage.objects.in_bulk({entry.page_id for entry in entries})
+    to_email = [
+        entry
+        for entry in entries
+        if entry.page_id in pages and pages[entry.page_id].to_address
+    ]
+    failed = send_emails(pages, to_email) if to_email else []
+
+    now = timezone.now()
+    retried = []
+    for entry, error in failed:
+        entry.attempts += 1
+        entry.last_error = str(error)
+        if entry.attempts >= settings.FORM_EMAIL_MAX_ATTEMPTS:
+            logger.error(
+                "Gave up emailing form submission %d: %s", entry.submission_id, error
+            )
+            continue
+        entry.next_attempt_at = now + get_retry_delay(entry.attempts)
+        retried.append(entry)
+    QueuedSubmission.objects.bulk_update(
+        retried, ["attempts", "last_error", "next_attempt_at"]
+    )
+
+    done = {entry.pk for entry in entries} - {entry.pk for entry in retried}
+    QueuedSubmission.objects.filter(pk__in=done).delete()
+    logger.info(
+        "Processed %d form submissions, %d emails to retry", len(entries), len(retried)
+    )
+    return len(entries)
@@ -1,16 +1,24 @@
 from django import template
+from django.urls import reverse
 
-from wagtail.images.models import Image
+from apps.base.gallery import get_gallery_images, parse_cursor
 
 register = template.Library()
 
 
-# Retrieves a single gallery item and returns a gallery of images
+# Retrieves a single gallery item and returns a page of its images. Further
+# pages are loaded by keyset cursor, either through the "after" query string
+# parameter or the JSON endpoint used for infinite scroll.
 @register.inclusion_tag('tags/gallery.html', takes_context=True)
 def gallery(context, gallery):
-    images = Image.objects.filter(collection=gallery)
+    request = context['request']
+    images, next_cursor = get_gallery_images(
+        gallery, after=parse_cursor(request.GET.get('after'))
+    )
 
     return {
         'images': images,
-        'request': context['request'],
+        'next_cursor': next_cursor,
+        'feed_url': reverse('gallery_images', args=[gallery.pk]) if gallery else '',
+        'request': request,
     }
@@ -1,8 +1,16 @@
 from django import template
+from django.core.cache import cache
 
 from wagtail.models import Page, Site
 
 from apps.base.models import FooterText
+from apps.base.cache import CACHE_TIMEOUT
+from apps.base.rich_text import current_references
+from apps.base.navigation import (
+    chrome_cache_key,
+    get_menu_tree,
+    with_active_state,
+)
 
 
 register = template.Library()
@@ -17,13 +25,6 @@ def get_site_root(context):
     return Site.find_for_request(context["request"]).root_page
 
 
-def has_menu_children(page):
-    # This is used by the top_menu property
-    # get_children is a Treebeard API thing
-    # https://tabo.pe/projects/django-treebeard/docs/4.0.1/api.html
-    return page.get_children().live().in_menu().exists()
-
-
 def has_children(page):
     # Generically allow index pages to list their children
     return page.get_children().live().exists()
@@ -34,51 +35,34 @@ def is_active(page, current_page):
     return current_page.url_path.startswith(page.url_path) if current_page else False
 
 
-# Retrieves the top menu items - the immediate children of the parent page
-# The has_menu_children method is necessary because the Foundation menu requires
-# a dropdown class to be applied to a parent
+# Retrieves the top menu items - the immediate children of the parent page.
+# The menu tree is built once per site and locale and cached until a page is
+# published, unpublished, moved or deleted (see apps/base/signals.py), so the
+# active state is the only thing worked out per request.
+# show_dropdown is necessary because the Foundation menu requires a dropdown
+# class to be applied to a parent
 @register.inclusion_tag("tags/top_menu.html", takes_context=True)
 def top_menu(context, parent, calling_page=None):
-    menuitems = parent.get_children().live().in_menu()
-    for menuitem in menuitems:
-        menuitem.show_dropdown = has_menu_children(menuitem)
-        # We don't directly check if calling_page is None since the template
-        # engine can pass an empty string to calling_page
-        # if the variable passed as calling_page does not exist.
-        menuitem.active = (
-            calling_page.url_path.startswith(menuitem.url_path)
-            if calling_page
-            else False
-        )
+    # We don't directly check if calling_page is None since the template
+    # engine can pass an empty string to calling_page
+    # if the variable passed as calling_page does not exist.
+    menuitems = get_menu_tree(context["request"], parent, calling_page)
     return {
         "calling_page": calling_page,
-        "menuitems": menuitems,
-        # required by the pageurl tag that we want to use within this template
-        "request": context["request"],
+        "menuitems": with_active_state(menuitems, calling_page),
     }
 
 
-# Retrieves the children of the top menu items for the drop downs
+# Retrieves the children of the top menu items for the drop downs. `parent`
+# is a node of the cached menu tree handed down by top_menu.
 @register.inclusion_tag("tags/top_menu_children.html", takes_context=True)
 def top_menu_children(context, parent, calling_page=None):
-    menuitems_children = parent.get_children()
-    menuitems_children = menuitems_children.live().in_menu()
+    menuitems_children = with_active_state(parent["children"], calling_page)
     for menuitem in menuitems_children:
-        menuitem.has_dropdown = has_menu_children(menuitem)
-        # We don't directly check if calling_page is None since the template
-        # engine can pass an empty string to calling_page
-        # if the variable passed as calling_page does not exist.
-        menuitem.active = (
-            calling_page.url_path.startswith(menuitem.url_path)
-            if calling_page
-            else False
-        )
-        menuitem.children = menuitem.get_children().live().in_menu()
+        menuitem["has_dropdown"] = menuitem["show_dropdown"]
     return {
         "parent": parent,
         "menuitems_children": menuitems_children,
-        # required by the pageurl tag that we want to use within this template
-        "request": context["request"],
     }
 
 
@@ -98,10 +82,52 @@ def breadcrumbs(context):
 
 @register.inclusion_tag("base/include/footer_text.html", takes_context=True)
 def get_footer_text(context):
-    footer_text = ""
-    if FooterText.objects.first() is not None:
-        footer_text = FooterText.objects.first().body
+    footer_text = FooterText.objects.first()
+
+    # Usually collected with the links of the page already, see
+    # collect_footer_references in apps/base/rich_text.py
+    references = current_references.get()
+    if footer_text and references is not None:
+        references.add(footer_text.body)
 
     return {
-        "footer_text": footer_text,
+        "footer_text": footer_text.body if footer_text else "",
     }
+
+
+class ChromeCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, page):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.page = page
+
+    def render(self, context):
+        request = context.get("request")
+        if request is None or getattr(request, "is_preview", False):
+            # Previews may show unpublished titles in the breadcrumbs
+            return self.nodelist.render(context)
+
+        page = self.page.resolve(context) if self.page else None
+        key = chrome_cache_key(self.fragment_name, request, page)
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, CACHE_TIMEOUT)
+        return content
+
+
+# Caches the rendered page chrome (header, breadcrumbs, footer) shared by
+# every page, e.g. {% cache_chrome "header" self %}...{% endcache_chrome %}.
+# Entries are keyed on the site, locale and the path of the given page, and
+# are invalidated from apps/base/signals.py.
+@register.tag
+def cache_chrome(parser, token):
+    bits = token.split_contents()
+    if len(bits) not in (2, 3):
+        raise template.TemplateSyntaxError(
+            "'%s' tag takes a fragment name and an optional page" % bits[0]
+        )
+    nodelist = parser.parse(("endcache_chrome",))
+    parser.delete_first_token()
+    page = parser.compile_filter(bits[2]) if len(bits) == 3 else None
+    return ChromeCacheNode(nodelist, bits[1].strip("\"'"), page)
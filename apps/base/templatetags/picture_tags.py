@@ -0,0 +1,113 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from wagtail.images.models import SourceImageIOError
+from wagtail.images.shortcuts import get_rendition_or_not_found
+
+from apps.base.renditions import get_renditions, responsive_specs
+
+register = template.Library()
+
+
+def srcset(renditions):
+    return ", ".join(
+        "{} {}w".format(rendition.url, rendition.width) for rendition in renditions
+    )
+
+
+def get_responsive_renditions(image, spec):
+    # Returns the fallback and WebP renditions for every scale, largest last
+    pairs = responsive_specs(spec)
+    try:
+        renditions = get_renditions(image, [s for pair in pairs for s in pair])
+    except SourceImageIOError:
+        # Same behaviour as the image tag when the source file is missing
+        missing = get_rendition_or_not_found(image, spec)
+        return [missing], []
+    return (
+        [renditions[fallback] for fallback, webp in pairs],
+        [renditions[webp] for fallback, webp in pairs],
+    )
+
+
+class PictureNode(template.Node):
+    def __init__(self, image_expr, filter_spec, attrs):
+        self.image_expr = image_expr
+        self.filter_spec = filter_spec
+        self.attrs = attrs
+
+    def render(self, context):
+        try:
+            image = self.image_expr.resolve(context)
+        except template.VariableDoesNotExist:
+            return ""
+        if not image:
+            return ""
+
+        fallbacks, webps = get_responsive_renditions(image, self.filter_spec)
+        largest = fallbacks[-1]
+        attrs = {
+            "sizes": "(max-width: {0}px) 100vw, {0}px".format(largest.width),
+        }
+        attrs.update(largest.attrs_dict)
+        attrs.update((key, value.resolve(context)) for key, value in self.attrs.items())
+        if len(fallbacks) > 1:
+            attrs["srcset"] = srcset(fallbacks)
+
+        return format_html(
+            "<picture>{}<img {}></picture>",
+            format_html(
+                '<source type="image/webp" srcset="{}" sizes="{}">',
+                srcset(webps),
+                attrs["sizes"],
+            )
+            if webps
+            else "",
+            format_html_join(" ", '{}="{}"', attrs.items()),
+        )
+
+
+# Like Wagtail's {% image %} tag, but renders a <picture> with WebP and
+# fallback variants at several widths, e.g.
+# {% picture page.image fill-645x480-c100 loading="lazy" %}
+@register.tag
+def picture(parser, token):
+    bits = token.split_contents()[1:]
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            "'picture' tag should be of the form "
+            '{% picture self.photo max-320x200 [ custom-attr="value" ... ] %}'
+        )
+    image_expr = parser.compile_filter(bits[0])
+    attrs = {}
+    for bit in bits[2:]:
+        try:
+            name, value = bit.split("=", 1)
+        except ValueError:
+            raise template.TemplateSyntaxError(
+                "'picture' tag attributes should be of the form name=\"value\""
+            )
+        attrs[name] = parser.compile_filter(value)
+    return PictureNode(image_expr, bits[1], attrs)
+
+
+# CSS for a hero background image: modern browsers pick the WebP variant
+# through image-set(), others keep the first declaration, e.g.
+# style="{% background_image page.image fill-1920x600 %}"
+@register.simple_tag
+def background_image(image, spec):
+    if not image:
+        return ""
+    webp_spec = spec + "|format-webp"
+    try:
+        renditions = get_renditions(image, [spec, webp_spec])
+    except SourceImageIOError:
+        return format_html(
+            "background-image:url('{}')", get_rendition_or_not_found(image, spec).url
+        )
+    return format_html(
+        "background-image:url('{0}');"
+        "background-image:image-set(url('{1}') type('image/webp'), url('{0}'))",
+        renditions[spec].url,
+        renditions[webp_spec].url,
+    )
@@ -0,0 +1,10 @@
+from django import template
+
+register = template.Library()
+
+
+# Stands in for Wagtail's userbar where wagtail.admin isn't installed, see
+# config/settings/public.py
+@register.simple_tag
+def wagtailuserbar(position=""):
+    return ""
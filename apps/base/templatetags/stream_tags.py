@@ -0,0 +1,16 @@
+from django import template
+
+from apps.base.stream_cache import render_stream as render_cached_stream
+
+register = template.Library()
+
+
+# Renders a page's StreamField from the render cache, e.g.
+# {% render_stream page "body" %}
+@register.simple_tag(takes_context=True)
+def render_stream(context, page, field_name):
+    request = context.get("request")
+    if getattr(request, "is_preview", False):
+        # Previews render unsaved content that no revision ID describes
+        return getattr(page, field_name).render_as_block(context.flatten())
+    return render_cached_stream(page, field_name, context.flatten())
@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def get_redis_client(backend):
+    """
+    Returns the Redis client behind a cache backend, for django-redis and
+    Django's own Redis backend, or None for other backends.
+    """
+    client = getattr(backend, "client", None)
+    if hasattr(client, "get_client"):
+        return client.get_client(write=True)
+    client = getattr(backend, "_cache", None)
+    if hasattr(client, "get_client"):
+        return client.get_client(None, write=True)
+    return None
+
+
+class LocalTier:
+    """
+    The in-process LRU shared by every thread of a worker, holding pickled
+    values until their expiry. Like HitBuffer it's reset after a fork, so
+    workers don't inherit a preloading master's entries.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.entries = OrderedDict()
+        self.pid = os.getpid()
+        self.subscriber = None
+        # Tells this worker's own invalidations apart
+        self.sender = uuid.uuid4().hex
+        self.hits = self.shared_hits = self.misses = 0
+        self.reported_at = time.monotonic()
+
+    def check_pid(self):
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.reset()
+
+    def get_pickled(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            pickled, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        return pickled
+
+    def get(self, key):
+        pickled = self.get_pickled(key)
+        return MISSING if pickled is None else pickle.loads(pickled)
+
+    def set(self, key, value, timeout):
+        self.set_pickled(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), timeout)
+
+    def set_pickled(self, key, pickled, timeout):
+        with self.lock:
+            self.entries[key] = (pickled, time.monotonic() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def evict(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        gets = self.hits + self.shared_hits + self.misses
+        return {
+            "gets": gets,
+            "entries": len(self.entries),
+            "local_hit_rate": self.hits / gets if gets else 0,
+            "shared_hit_rate": self.shared_hits / gets if gets else 0,
+            "miss_rate": self.misses / gets if gets else 0,
+        }
+
+
+# Local tiers by LOCATION, shared by the per-thread backend instances
+local_tiers = {}
+local_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    """
+    A bounded in-process LRU in front of a shared cache, for hot keys that
+    are read on every request. LOCATION names the local tier; OPTIONS are:
+
+    - SHARED: the alias of the shared cache, e.g. Redis
+    - MAX_ENTRIES: the size of the local tier
+    - LOCAL_TIMEOUT: seconds a value is kept locally at most, which bounds
+      staleness if an invalidation is missed
+    - LOCAL_KEY_PREFIXES: only keys starting with one of these are kept
+      locally; the rest go straight to the shared cache
+    - CHANNEL: the Redis channel for invalidations
+    - STATS_INTERVAL: seconds between logging each worker's hit rates
+
+    Writes and deletes go to the shared cache and are published on CHANNEL,
+    so every other worker evicts its local copy. Setting a key to the value
+    this worker already holds locally is a no-op. Without a Redis shared
+    cache (e.g. locmem in development) nothing is published, and local
+    copies are only bounded by LOCAL_TIMEOUT.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options["SHARED"]
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self.local_key_prefixes = tuple(options.get("LOCAL_KEY_PREFIXES", ("",)))
+        self.channel = options.get("CHANNEL", "cache-invalidation:" + location)
+        self.stats_interval = options.get("STATS_INTERVAL", 300)
+        with local_tiers_lock:
+            if location not in local_tiers:
+                local_tiers[location] = LocalTier(self._max_entries)
+        self.local = local_tiers[location]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def is_local(self, key):
+        return key.startswith(self.local_key_prefixes)
+
+    def local_key(self, key, version):
+        return self.make_key(key, version)
+
+    def local_timeout_for(self, timeout):
+        timeout = self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    # Local tier
+
+    def ensure_subscriber(self):
+        local = self.local
+        local.check_pid()
+        if local.subscriber is not None and local.subscriber.is_alive():
+            return
+        with local.lock:
+            if local.subscriber is None or not local.subscriber.is_alive():
+                if get_redis_client(self.shared) is None:
+                    return
+                local.subscriber = threading.Thread(
+                    target=self.subscribe, name="cache-invalidation", daemon=True
+                )
+                local.subscriber.start()
+
+    def subscribe(self):
+        while True:
+            try:
+                pubsub = get_redis_client(self.shared).pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(self.channel)
+                # Messages sent while we weren't listening are lost
+                self.local.clear()
+                for message in pubsub.listen():
+                    self.receive(message["data"])
+            except Exception:
+                logger.exception("Cache invalidation subscriber failed")
+                time.sleep(1)
+
+    def receive(self, data):
+        message = json.loads(data)
+        if message["sender"] == self.local.sender:
+            return
+        if message["keys"] is None:
+            self.local.clear()
+        else:
+            self.local.evict(message["keys"])
+
+    def publish(self, keys):
+        # None clears every local copy
+        client = get_redis_client(self.shared)
+        if client is None:
+            return
+        try:
+            client.publish(
+                self.channel, json.dumps({"sender": self.local.sender, "keys": keys})
+            )
+        except Exception:
+            logger.exception("Failed to publish cache invalidation")
+
+    def invalidate(self, keys, version):
+        keys = [self.local_key(key, version) for key in keys if self.is_local(key)]
+        if keys:
+            self.local.evict(keys)
+            self.publish(keys)
+
+    def count(self, hits=0, shared_hits=0, misses=0):
+        local = self.local
+        local.hits += hits
+        local.shared_hits += shared_hits
+        local.misses += misses
+        if time.monotonic() - local.reported_at > self.stats_interval:
+            local.reported_at = time.monotonic()
+            logger.info("Two-tier cache %s: %s", self.channel, local.stats())
+
+    def stats(self):
+        return self.local.stats()
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        if not self.is_local(key):
+            return self.shared.get(key, default, version=version)
+        self.ensure_subscriber()
+        local_key = self.local_key(key, version)
+        value = self.local.get(local_key)
+        if value is not MISSING:
+            self.count(hits=1)
+            return value
+        value = self.shared.get(key, MISSING, version=version)
+        if value is MISSING:
+            self.count(misses=1)
+            return default
+        self.count(shared_hits=1)
+        self.local.set(local_key, value, self.local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        self.ensure_subscriber()
+        found = {}
+        remote = []
+        for key in keys:
+            value = MISSING
+            if self.is_local(key):
+                value = self.local.get(self.local_key(key, version))
+            if value is MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        shared_found = self.shared.get_many(remote, version=version) if remote else {}
+        for key, value in shared_found.items():
+            if self.is_local(key):
+                self.local.set(self.local_key(key, version), value, self.local_timeout)
+        found.update(shared_found)
+        local_keys = [key for key in keys if self.is_local(key)]
+        if local_keys:
+            self.count(
+                hits=sum(1 for key in local_keys if key not in remote),
+                shared_hits=sum(1 for key in local_keys if key in shared_found),
+                misses=sum(
+                    1 for key in local_keys if key in remote and key not in found
+                ),
+            )
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self.is_local(key):
+            self.shared.set(key, value, timeout, version=version)
+            return
+        local_key = self.local_key(key, version)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        # Wagtail sets a rendition again on every lookup, hits included;
+        # writing a value this worker already holds would only evict it from
+        # every other worker
+        if self.local.get_pickled(local_key) == pickled:
+            return
+        self.shared.set(key, value, timeout, version=version)
+        self.invalidate([key], version)
+        if self.local_timeout_for(timeout) > 0:
+            self.local.set_pickled(local_key, pickled, self.local_timeout_for(timeout))
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self.invalidate(list(data), version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # The local copy is only dropped: another worker may have won
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.invalidate([key], version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        self.invalidate([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        self.invalidate(keys, version)
+
+    def has_key(self, key, version=None):
+        if self.is_local(key):
+            if self.local.get(self.local_key(key, version)) is not MISSING:
+                return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # Atomic in the shared cache; generation counters rely on it
+        value = self.shared.incr(key, delta, version=version)
+        self.invalidate([key], version)
+        return value
+
+    def clear(self):
+        self.shared.clear()
+        self.local.clear()
+        self.publish(None)
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
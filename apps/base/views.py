@@ -0,0 +1,146 @@
+import mimetypes
+import os
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.utils._os import safe_join
+
+from wagtail import hooks
+from wagtail.documents.views import serve as document_views
+from wagtail.models import Collection, Locale, Site
+
+from apps.base import sitemaps
+from apps.base.gallery import get_gallery_images, parse_cursor
+from apps.base.models import FormPage, GalleryPage
+from apps.base.renditions import GALLERY_FILTER_SPEC
+from apps.base.sendfile import restore_headers, sendfile
+
+
+async def gallery_images(request, collection_id):
+    # Lightweight JSON feed of a gallery used by the infinite scroll
+    results = await sync_to_async(get_gallery_rows)(
+        collection_id, parse_cursor(request.GET.get("after"))
+    )
+    if results is None:
+        raise Http404
+    return JsonResponse(results)
+
+
+def get_gallery_rows(collection_id, after):
+    # Only the collections of live, unrestricted gallery pages are served
+    collection = Collection.objects.filter(
+        pk=collection_id,
+        pk__in=GalleryPage.objects.live().public().values("collection"),
+    ).first()
+    if collection is None:
+        return None
+
+    # Prefetched renditions and any missing ones created on the fly
+    images, next_cursor = get_gallery_images(collection, after=after)
+    results = []
+    for image in images:
+        rendition = image.get_rendition(GALLERY_FILTER_SPEC)
+        results.append(
+            {
+                "id": image.pk,
+                "title": image.title,
+                "url": rendition.url,
+                "width": rendition.width,
+                "height": rendition.height,
+                "alt": rendition.alt,
+            }
+        )
+    return {"images": results, "next": next_cursor}
+
+
+async def form_submit(request, page_id):
+    """
+    Takes the submissions of a FormPage, see templates/base/form_page.html.
+    Valid submissions are queued in one insert and thanked for at once.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+    page = await FormPage.objects.live().filter(pk=page_id).afirst()
+    if page is None:
+        raise Http404
+
+    form, response = await sync_to_async(get_submitted_form)(request, page)
+    if response is not None:
+        return response
+
+    # Queued for the `process_form_queue` worker, like Wagtail's own view
+    await sync_to_async(page.process_form_submission)(form)
+    return await sync_to_async(page.render_landing_page)(request)
+
+
+def get_submitted_form(request, page):
+    """
+    Returns the valid form, or the response to send instead: the page's
+    view restrictions, or the page again with the form's errors.
+    """
+    for fn in hooks.get_hooks("before_serve_page"):
+        result = fn(page, request, [], {})
+        if isinstance(result, HttpResponse):
+            return None, result
+
+    form = page.get_form(request.POST, request.FILES, page=page, user=request.user)
+    if form.is_valid():
+        return form, None
+    context = page.get_context(request)
+    context["form"] = form
+    return None, TemplateResponse(request, page.get_template(request), context)
+
+
+def get_site(request):
+    site = Site.find_for_request(request)
+    if site is None:
+        site = Site.objects.select_related("root_page").get(is_default_site=True)
+    return site
+
+
+def sitemap_index(request):
+    content, last_modified = sitemaps.get_index(get_site(request))
+    return sitemaps.sitemap_response(request, content, last_modified)
+
+
+def sitemap_shard(request, language_code, shard):
+    locale = get_object_or_404(Locale, language_code=language_code)
+    content, last_modified = sitemaps.get_shard_sitemap(
+        request, get_site(request), locale, shard
+    )
+    if content is None:
+        raise Http404
+    return sitemaps.sitemap_response(request, content, last_modified)
+
+
+def serve_document(request, document_id, document_filename):
+    # Wagtail's view, with the headers of the range actually sent
+    return restore_headers(
+        document_views.serve(request, document_id, document_filename)
+    )
+
+
+def serve_media(request, path):
+    # Image originals and renditions. Documents are served by Wagtail's view
+    # (through the same sendfile backend), which checks privacy first
+    if ".." in path.split("/"):
+        raise Http404
+    try:
+        filename = os.path.realpath(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    # Checked on the resolved path, so "images/../documents/" and symlinks
+    # can't reach the documents either
+    relative = os.path.relpath(filename, os.path.realpath(settings.MEDIA_ROOT))
+    parts = relative.split(os.sep)
+    if parts[0] == "documents" or ".." in parts:
+        raise Http404
+    if not os.path.isfile(filename):
+        raise Http404
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return sendfile(request, filename, mimetype=mimetype)
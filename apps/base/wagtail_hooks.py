@@ -0,0 +1,54 @@
+from django.apps import apps
+
+from wagtail import hooks
+
+from apps.base.models import People
+from apps.base.people import with_thumbnails
+
+from apps.base.rich_text import (
+    BatchedDocumentLinkHandler,
+    BatchedImageEmbedHandler,
+    BatchedPageLinkHandler,
+    collect_footer_references,
+    collect_page_references,
+)
+
+
+# Runs after Wagtail's own registrations, replacing their handlers
+@hooks.register("register_rich_text_features", order=1)
+def register_batched_rich_text_handlers(features):
+    features.register_link_type(BatchedPageLinkHandler)
+    features.register_link_type(BatchedDocumentLinkHandler)
+    features.register_embed_type(BatchedImageEmbedHandler)
+
+
+@hooks.register("before_serve_page")
+def collect_rich_text_references(page, request, serve_args, serve_kwargs):
+    collect_page_references(page)
+    # The footer renders last, after the page's links were resolved
+    collect_footer_references(request)
+
+
+# The public-only settings don't install the admin apps, see
+# config/settings/public.py
+if apps.is_installed("wagtail.contrib.modeladmin"):
+    from wagtail.contrib.modeladmin.options import ModelAdmin, modeladmin_register
+
+    @modeladmin_register
+    class PeopleAdmin(ModelAdmin):
+        """
+        Lists People with their thumbnails, which are fetched for the whole
+        page in one query rather than one per row.
+        """
+
+        model = People
+        menu_label = "People"
+        menu_icon = "group"
+        menu_order = 300
+        list_display = ("thumb_image", "first_name", "last_name", "job_title")
+        list_per_page = 50
+        ordering = ("last_name", "first_name", "id")
+        search_fields = ("first_name", "last_name", "job_title")
+
+        def get_queryset(self, request):
+            return with_thumbnails(super().get_queryset(request))
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = "apps.search"
+    label = "search"
+
+    def ready(self):
+        from apps.search import signals
+
+        signals.register_index_queue_handlers()
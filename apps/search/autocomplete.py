@@ -0,0 +1,195 @@
+import logging
+import threading
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from wagtail.models import Page
+
+from apps.base.cache import CACHE_TIMEOUT, bump_generation, get_generation
+from apps.search.cache import normalise_query
+
+logger = logging.getLogger(__name__)
+
+
+def page_suggestion(page):
+    return {"title": page.title, "url": page.get_url(), "type": "page"}
+
+
+def person_suggestion(person):
+    return {"title": str(person), "url": None, "type": "person"}
+
+
+def get_terms(text):
+    # Every word starts a term, so "Sourdough Bread" is found by "sou",
+    # "bread" and "sourdough b"
+    words = normalise_query(text).split()
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+# Most changes a worker applies in one go before rebuilding instead
+MAX_CHANGES = 500
+
+
+def change_key(generation):
+    return "autocomplete:change:{}".format(generation)
+
+
+def get_page_suggestions(page_ids=None):
+    # Anonymous visitors use the endpoint, so pages behind a view
+    # restriction are left out
+    pages = Page.objects.live().public().filter(depth__gt=1)
+    if page_ids is not None:
+        pages = pages.filter(pk__in=page_ids)
+    return {("page", page.pk): page_suggestion(page) for page in pages}
+
+
+def get_person_suggestions(person_ids=None):
+    from apps.base.models import People
+
+    people = People.objects.all()
+    if person_ids is not None:
+        people = people.filter(pk__in=person_ids)
+    return {("person", person.pk): person_suggestion(person) for person in people}
+
+
+def get_index_terms(suggestions):
+    return [
+        (term, key)
+        for key, suggestion in suggestions.items()
+        for term in get_terms(suggestion["title"])
+    ]
+
+
+class PrefixIndex:
+    """
+    A sorted array of (term, object key) pairs searched with bisect, giving
+    prefix lookups in O(log n) without touching the database. Updates copy
+    the array and swap it in, so lookups never need a lock.
+
+    Every change bumps the "autocomplete" generation counter and records
+    the keys of the changed objects in the cache under the new generation.
+    Each process catches up on its next lookup by reloading just those
+    objects. It only rebuilds the whole index when a record is missing,
+    e.g. evicted, or when there are too many to apply.
+    """
+
+    def __init__(self):
+        self.terms = []
+        self.suggestions = {}
+        self.generation = None
+        self.lock = threading.Lock()
+
+    def build(self):
+        generation = get_generation("autocomplete")
+        suggestions = get_page_suggestions()
+        suggestions.update(get_person_suggestions())
+        terms = sorted(get_index_terms(suggestions))
+        with self.lock:
+            self.terms, self.suggestions = terms, suggestions
+            self.generation = generation
+
+    def warm(self):
+        try:
+            self.build()
+        except DatabaseError:
+            # e.g. migrations haven't run yet; the first lookup will retry
+            logger.exception("Failed to build the autocomplete index")
+
+    def get_changes(self, generation):
+        # The keys changed since our generation, or None if some weren't
+        # recorded
+        if self.generation is None or generation < self.generation:
+            return None
+        if generation - self.generation > MAX_CHANGES:
+            return None
+        keys = [change_key(g) for g in range(self.generation + 1, generation + 1)]
+        recorded = cache.get_many(keys)
+        if len(recorded) != len(keys):
+            return None
+        return {tuple(key) for changed in recorded.values() for key in changed}
+
+    def sync(self):
+        generation = get_generation("autocomplete")
+        if generation == self.generation:
+            return
+        changes = self.get_changes(generation)
+        if changes is None or len(changes) > MAX_CHANGES:
+            self.build()
+            return
+
+        page_ids = {pk for kind, pk in changes if kind == "page"}
+        person_ids = {pk for kind, pk in changes if kind == "person"}
+        suggestions = {}
+        if page_ids:
+            suggestions.update(get_page_suggestions(page_ids))
+        if person_ids:
+            suggestions.update(get_person_suggestions(person_ids))
+
+        with self.lock:
+            if self.generation == generation:
+                return
+            terms = [entry for entry in self.terms if entry[1] not in changes]
+            terms.extend(get_index_terms(suggestions))
+            # Mostly sorted already, so this is close to linear
+            terms.sort()
+            merged = {
+                key: suggestion
+                for key, suggestion in self.suggestions.items()
+                if key not in changes
+            }
+            merged.update(suggestions)
+            self.terms, self.suggestions = terms, merged
+            self.generation = generation
+
+    def lookup(self, prefix, limit=8):
+        self.sync()
+
+        prefix = normalise_query(prefix)
+        if not prefix:
+            return []
+        terms, suggestions = self.terms, self.suggestions
+
+        results = []
+        seen = set()
+        start = bisect_left(terms, (prefix,))
+        for term, key in terms[start:]:
+            if not term.startswith(prefix) or len(results) >= limit:
+                break
+            if key not in seen:
+                seen.add(key)
+                results.append(suggestions[key])
+        return results
+
+
+prefix_index = PrefixIndex()
+
+
+def record_changes(keys):
+    """
+    Records that the suggestions for the given (kind, ID) keys changed, for
+    every process to reload them on its next lookup.
+    """
+    keys = [list(key) for key in keys]
+    if keys:
+        generation = bump_generation("autocomplete")
+        cache.set(change_key(generation), keys, CACHE_TIMEOUT)
+
+
+def update_pages(page_ids):
+    record_changes(("page", pk) for pk in set(page_ids))
+
+
+def update_page(page):
+    update_pages([page.pk])
+
+
+def update_subtree(page):
+    # For changes to the URLs or visibility of a page and everything below
+    # it, e.g. a move, a new slug or a view restriction
+    update_pages(page.get_descendants(inclusive=True).values_list("pk", flat=True))
+
+
+def update_person(person):
+    record_changes([("person", person.pk)])
@@ -0,0 +1,45 @@
+import hashlib
+import unicodedata
+
+from django.core.cache import cache
+from django.utils import translation
+
+from wagtail.models import Page
+
+from apps.base.cache import CACHE_TIMEOUT, get_generation
+
+# Ranked results kept per query; nobody pages past this
+MAX_CACHED_RESULTS = 500
+
+
+def normalise_query(query_string):
+    # Unicode compatibility forms and case are folded and whitespace
+    # collapsed, so "Café", " café " and "CAFÉ" share one entry
+    query_string = unicodedata.normalize("NFKC", query_string).casefold()
+    return " ".join(query_string.split())
+
+
+def results_cache_key(query_string):
+    return "search:results:{}:{}:{}".format(
+        get_generation("search"),
+        translation.get_language(),
+        hashlib.md5(normalise_query(query_string).encode("utf-8")).hexdigest(),
+    )
+
+
+def get_search_results(query_string):
+    """
+    Returns the ranked (page ID, content type ID) pairs matching a query.
+    The search backend only runs once per query until a page is published
+    or unpublished, or the index worker writes a batch; every page of
+    results is a slice of the cached list.
+    """
+    key = results_cache_key(query_string)
+    results = cache.get(key)
+    if results is None:
+        pages = Page.objects.live().search(normalise_query(query_string))
+        results = [
+            (page.pk, page.content_type_id) for page in pages[:MAX_CACHED_RESULTS]
+        ]
+        cache.set(key, results, CACHE_TIMEOUT)
+    return results
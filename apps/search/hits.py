@@ -0,0 +1,120 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from wagtail.search.models import Query, QueryDailyHits
+from wagtail.search.utils import normalise_query_string
+
+logger = logging.getLogger(__name__)
+
+
+class HitBuffer:
+    """
+    Collects search hits in memory, aggregated per (query, day), and writes
+    the totals in bulk from a background thread every `interval` seconds or
+    once `max_size` distinct entries are waiting. Whatever is left is
+    flushed when the worker shuts down.
+    """
+
+    def __init__(self, interval, max_size):
+        self.interval = interval
+        self.max_size = max_size
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.pid = None
+
+    def record(self, query_string):
+        query_string = normalise_query_string(query_string)
+        if not query_string:
+            return
+        with self.lock:
+            self.counts[query_string, timezone.now().date()] += 1
+            full = len(self.counts) >= self.max_size
+        self.ensure_thread()
+        if full:
+            self.wakeup.set()
+
+    def ensure_thread(self):
+        # Threads don't survive a fork, so check the pid as well: the buffer
+        # may have been created in a preloading master process
+        if self.pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.pid != os.getpid() or not self.thread.is_alive():
+                self.pid = os.getpid()
+                self.thread = threading.Thread(
+                    target=self.run, name="search-hits", daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to write search hits")
+            finally:
+                # This thread has its own database connection
+                connection.close()
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+        if not counts:
+            return
+        try:
+            self.write(counts)
+        except Exception:
+            # The increments are written in one transaction, so none of these
+            # hits were counted; keep them for the next flush
+            with self.lock:
+                self.counts.update(counts)
+            raise
+
+    def write(self, counts):
+        query_strings = {query_string for query_string, date in counts}
+        Query.objects.bulk_create(
+            [Query(query_string=query_string) for query_string in query_strings],
+            ignore_conflicts=True,
+        )
+        query_ids = dict(
+            Query.objects.filter(query_string__in=query_strings).values_list(
+                "query_string", "pk"
+            )
+        )
+
+        with transaction.atomic():
+            QueryDailyHits.objects.bulk_create(
+                [
+                    QueryDailyHits(query_id=query_ids[query_string], date=date)
+                    for query_string, date in counts
+                ],
+                ignore_conflicts=True,
+            )
+            # One increment per (query, day) rather than per search, and
+            # concurrent workers can't overwrite each other's counts
+            for (query_string, date), hits in counts.items():
+                QueryDailyHits.objects.filter(
+                    query_id=query_ids[query_string], date=date
+                ).update(hits=models.F("hits") + hits)
+
+
+buffer = HitBuffer(
+    interval=getattr(settings, "SEARCH_HITS_FLUSH_INTERVAL", 10),
+    max_size=getattr(settings, "SEARCH_HITS_BUFFER_SIZE", 1000),
+)
+atexit.register(buffer.flush)
+
+
+def record_hit(query_string):
+    buffer.record(query_string)
@@ -0,0 +1,156 @@
+import logging
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from wagtail.models import ModelLogEntry, Page, PageLogEntry
+from wagtail.search.backends import get_search_backends
+from wagtail.search.index import class_is_indexed
+
+from apps.base.cache import bump_generation
+from apps.search.models import IndexQueueEntry
+
+logger = logging.getLogger(__name__)
+
+# How long a worker has to index the entries it claimed before another
+# worker may take them over
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def get_content_type_id(instance):
+    # Pages are indexed as their specific type, whichever class was saved
+    if isinstance(instance, Page):
+        return instance.content_type_id
+    return ContentType.objects.get_for_model(instance).pk
+
+
+def enqueue(content_type_id, object_id):
+    now = timezone.now()
+    entries = IndexQueueEntry.objects.filter(
+        content_type_id=content_type_id, object_id=str(object_id)
+    )
+    # Bumping queued_at keeps a worker that is indexing an older copy of the
+    # object from removing the entry, and releasing the claim lets another
+    # worker pick it up meanwhile
+    if not entries.update(queued_at=now, claimed_until=None):
+        IndexQueueEntry.objects.bulk_create(
+            [
+                IndexQueueEntry(
+                    content_type_id=content_type_id,
+                    object_id=str(object_id),
+                    queued_at=now,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def enqueue_instance(instance):
+    enqueue(get_content_type_id(instance), instance.pk)
+
+
+def enqueue_changed_since(since):
+    """
+    Queues every indexed object changed since the given datetime, according
+    to the page and snippet audit logs and page publish dates. Returns the
+    number of objects queued.
+    """
+    changed = set(
+        PageLogEntry.objects.filter(timestamp__gte=since).values_list(
+            "content_type_id", "page_id"
+        )
+    )
+    changed.update(
+        Page.objects.filter(last_published_at__gte=since).values_list(
+            "content_type_id", "pk"
+        )
+    )
+    changed.update(
+        ModelLogEntry.objects.filter(timestamp__gte=since).values_list(
+            "content_type_id", "object_id"
+        )
+    )
+
+    queued = 0
+    for content_type_id, object_id in changed:
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is not None and class_is_indexed(model):
+            enqueue(content_type_id, object_id)
+            queued += 1
+    return queued
+
+
+def claim_entries(batch_size):
+    """
+    Claims the oldest `batch_size` entries that no other worker is indexing,
+    in a transaction that only lasts as long as the claim itself. Claims
+    expire after CLAIM_TIMEOUT, in case their worker died.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            IndexQueueEntry.objects.select_for_update(skip_locked=True)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+            .order_by("queued_at")[:batch_size]
+        )
+        IndexQueueEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            claimed_until=now + CLAIM_TIMEOUT
+        )
+    return entries
+
+
+def index_entries(entries):
+    ids_by_type = {}
+    for entry in entries:
+        ids_by_type.setdefault(entry.content_type_id, set()).add(entry.object_id)
+
+    backends = list(get_search_backends())
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None or not class_is_indexed(model):
+            continue
+
+        objects = list(model.get_indexed_objects().filter(pk__in=object_ids))
+        deleted = object_ids - {str(obj.pk) for obj in objects}
+        for backend in backends:
+            if objects:
+                backend.add_bulk(model, objects)
+            for object_id in deleted:
+                backend.delete(model(pk=object_id))
+        logger.info(
+            "Indexed %d and removed %d %s objects",
+            len(objects),
+            len(deleted),
+            model._meta.label,
+        )
+
+
+def process_queue(batch_size=100):
+    """
+    Indexes the oldest `batch_size` queued objects, one bulk insert per model
+    and search backend, and removes objects that no longer exist from the
+    index. No rows are locked while indexing, so saving a queued object
+    never waits for the worker. Returns the number of entries processed.
+    """
+    started = timezone.now()
+    entries = claim_entries(batch_size)
+    if not entries:
+        return 0
+    processed = IndexQueueEntry.objects.filter(pk__in=[entry.pk for entry in entries])
+
+    try:
+        index_entries(entries)
+    except Exception:
+        # Up for grabs again straight away rather than after CLAIM_TIMEOUT
+        processed.update(claimed_until=None)
+        raise
+
+    # Entries queued again while we were indexing stay in the queue
+    processed.filter(queued_at__lte=started).delete()
+
+    # Cached result lists were ranked by the index as it was before
+    bump_generation("search")
+    return len(entries)
@@ -0,0 +1,22 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from apps.base.management.utils import parse_since
+from apps.search.indexing import enqueue_changed_since
+
+
+class Command(BaseCommand):
+    help = (
+        "Reindex only the pages and snippets changed since a date, instead of "
+        "rebuilding the whole index with update_index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "since", help="ISO 8601 date or datetime, e.g. 2022-09-01T12:00"
+        )
+
+    def handle(self, *args, **options):
+        queued = enqueue_changed_since(parse_since(options["since"]))
+        self.stdout.write("Queued %d changed objects" % queued)
+        call_command("process_index_queue", stdout=self.stdout)
@@ -0,0 +1,26 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class IndexQueueEntry(models.Model):
+    """
+    An object waiting to be (re)indexed by the `process_index_queue` worker.
+    Saving an indexed model only records (content type, object ID) here, so
+    editors don't wait for the search index to be updated on publish.
+    Repeated saves of the same object collapse into one entry.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(max_length=255)
+    queued_at = models.DateTimeField(db_index=True)
+    # Set while a worker is indexing the object, see indexing.claim_entries()
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return "{} {}".format(self.content_type, self.object_id)
+
+    class Meta:
+        unique_together = [("content_type", "object_id")]
+        verbose_name_plural = "Index queue entries"
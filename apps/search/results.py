@@ -0,0 +1,57 @@
+from django.contrib.contenttypes.models import ContentType
+
+from wagtail.images.models import Image
+
+from apps.base.renditions import LISTING_CARD_FILTER_SPEC, all_responsive_specs
+
+
+def get_result_rows(results, request):
+    """
+    Turns a page of (page ID, content type ID) search results into plain
+    rows for the templates. The specific pages are loaded with one query
+    per concrete page type, and their images and thumbnail renditions with
+    one query each, so the query count doesn't grow with the number of
+    results.
+    """
+    ids_by_type = {}
+    for page_id, content_type_id in results:
+        ids_by_type.setdefault(content_type_id, []).append(page_id)
+
+    specific_pages = {}
+    for content_type_id, ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            # The page type's model no longer exists
+            continue
+        specific_pages.update(
+            (page.pk, page) for page in model.objects.filter(pk__in=ids)
+        )
+
+    image_ids = {
+        getattr(page, "image_id", None) for page in specific_pages.values()
+    } - {None}
+    images = {}
+    if image_ids:
+        images = {
+            image.pk: image
+            for image in Image.objects.filter(pk__in=image_ids).prefetch_renditions(
+                *all_responsive_specs(LISTING_CARD_FILTER_SPEC)
+            )
+        }
+
+    rows = []
+    for page_id, content_type_id in results:
+        specific = specific_pages.get(page_id)
+        if specific is None:
+            # Deleted since the results were cached
+            continue
+        rows.append(
+            {
+                "title": specific.title,
+                "url": specific.get_url(request),
+                "content_type": specific._meta.model_name,
+                "search_description": specific.search_description,
+                "image": images.get(getattr(specific, "image_id", None)),
+            }
+        )
+    return rows
@@ -0,0 +1,73 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.search import index
+from wagtail.models import Page, PageViewRestriction
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from apps.base.cache import bump_generation
+from apps.base.models import People
+from apps.base.signals import get_previous_live_revision
+from apps.search import autocomplete
+from apps.search.indexing import enqueue_instance
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def search_results_changed(sender, instance, **kwargs):
+    # Cached result lists are keyed on this generation, see apps/search/cache.py
+    bump_generation("search")
+
+
+@receiver(page_published)
+def autocomplete_page_published(sender, instance, **kwargs):
+    previous = get_previous_live_revision(instance)
+    if previous is not None and previous.content.get("slug") != instance.slug:
+        # The URLs of the whole subtree changed
+        autocomplete.update_subtree(instance)
+    else:
+        autocomplete.update_page(instance)
+
+
+@receiver(page_unpublished)
+def autocomplete_page_unpublished(sender, instance, **kwargs):
+    autocomplete.update_page(instance)
+
+
+@receiver(post_delete)
+def autocomplete_page_deleted(sender, instance, **kwargs):
+    if isinstance(instance, Page) and instance.live:
+        autocomplete.update_page(instance)
+
+
+@receiver(post_page_move)
+def autocomplete_page_moved(sender, instance, **kwargs):
+    autocomplete.update_subtree(instance)
+
+
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def autocomplete_restriction_changed(sender, instance, **kwargs):
+    # Restricted pages are left out of the suggestions. The page may have
+    # been deleted along with the restriction
+    page = Page.objects.filter(pk=instance.page_id).first()
+    if page is not None:
+        autocomplete.update_subtree(page)
+
+
+@receiver(post_save, sender=People)
+@receiver(post_delete, sender=People)
+def autocomplete_person_changed(sender, instance, **kwargs):
+    autocomplete.update_person(instance)
+
+
+def index_changed(sender, instance, **kwargs):
+    enqueue_instance(instance)
+
+
+def register_index_queue_handlers():
+    # Search backends run with AUTO_UPDATE off; saves and deletes of indexed
+    # models are queued for the process_index_queue worker instead
+    for model in index.get_indexed_models():
+        post_save.connect(index_changed, sender=model)
+        post_delete.connect(index_changed, sender=model)
@@ -1,23 +1,28 @@
+from asgiref.sync import sync_to_async
+
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.http import JsonResponse
 from django.template.response import TemplateResponse
 
-from wagtail.core.models import Page
-from wagtail.search.models import Query
+from apps.search.autocomplete import prefix_index
+from apps.search.cache import get_search_results
+from apps.search.hits import record_hit
+from apps.search.results import get_result_rows
 
 
-def search(request):
+async def search(request):
     search_query = request.GET.get("query", None)
     page = request.GET.get("page", 1)
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
+        # Ranked page IDs, cached per normalised query
+        search_results = await sync_to_async(get_search_results)(search_query)
 
-        # Record hit
-        query.add_hit()
+        # Record hit; written to the database in bulk in the background
+        record_hit(search_query)
     else:
-        search_results = Page.objects.none()
+        search_results = []
 
     # Pagination
     paginator = Paginator(search_results, 10)
@@ -27,6 +32,9 @@ def search(request):
         search_results = paginator.page(1)
     except EmptyPage:
         search_results = paginator.page(paginator.num_pages)
+    search_results.object_list = await sync_to_async(get_result_rows)(
+        search_results.object_list, request
+    )
 
     return TemplateResponse(
         request,
@@ -36,3 +44,12 @@ def search(request):
             "search_results": search_results,
         },
     )
+
+
+async def autocomplete(request):
+    # Typeahead suggestions, served from the in-process prefix index. A
+    # lookup is a bisect in memory, unless another process changed the
+    # index and it has to be rebuilt from the database
+    query = request.GET.get("q", "")
+    suggestions = await sync_to_async(prefix_index.lookup)(query[:100])
+    return JsonResponse({"suggestions": suggestions})
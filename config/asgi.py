@@ -0,0 +1,61 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with uvicorn workers under gunicorn:
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --workers 2
+
+docker-entrypoint.sh does this when SERVER_INTERFACE=asgi.
+
+Concurrency per worker, compared with config/wsgi.py:
+
+- WSGI, gunicorn sync workers: one request at a time per worker. Two
+  workers serve two requests at once, and a request waiting on a slow
+  embed provider or search backend holds its worker for the whole wait.
+- ASGI, uvicorn workers: the async views (search, search autocomplete, the
+  gallery feed and form submissions) wait for I/O without holding the
+  worker, so one worker has any number of them in flight. Database and
+  cache calls still run one at a time in the worker's sync thread. Form
+  submissions are only queued; the `process_form_queue` worker saves
+  and emails them.
+- Wagtail page views, the admin and documents are sync views: under ASGI
+  each worker runs them one at a time in its sync thread, like a sync
+  worker, with a little overhead for switching threads. Scale them with
+  workers, as before.
+
+Static files are served before Django by AsgiStaticFilesApp, as in WSGI.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+
+application = get_asgi_application()
+
+# Serve collected static files, precompressed, before Django's URL resolver
+from django.conf import settings  # noqa: E402
+
+from apps.base.staticfiles import AsgiStaticFilesApp  # noqa: E402
+
+application = AsgiStaticFilesApp(application, settings.STATIC_ROOT, settings.STATIC_URL)
+
+# Build the typeahead index before the first request rather than during it
+from apps.search.autocomplete import prefix_index  # noqa: E402
+
+prefix_index.warm()
+
+# With gunicorn --preload this module is loaded before the workers fork;
+# they mustn't share the connection the warm-up opened
+from django.db import connections  # noqa: E402
+
+connections.close_all()
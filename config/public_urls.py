@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.urls import include, path, re_path
+from wagtail import urls as wagtail_urls
+from wagtail.documents import urls as wagtaildocs_urls
+from apps.base import views as base_views
+from apps.search import views as search_views
+
+# The public site, without the admins; used on its own by
+# config/settings/public.py, and included by config/urls.py
+
+urlpatterns = [
+    # Documents, served by Wagtail's view with Range support, see
+    # apps/base/sendfile.py
+    re_path(r"^documents/(\d+)/(.*)$", base_views.serve_document),
+    path("documents/", include(wagtaildocs_urls)),
+    # Gallery feed for infinite scroll
+    path(
+        "gallery/<int:collection_id>/images/",
+        base_views.gallery_images,
+        name="gallery_images",
+    ),
+    # Form page submissions
+    path(
+        "forms/<int:page_id>/submit/",
+        base_views.form_submit,
+        name="form_submit",
+    ),
+    # Search
+    path("search/", search_views.search, name="search"),
+    path(
+        "search/autocomplete/",
+        search_views.autocomplete,
+        name="search_autocomplete",
+    ),
+    # Sitemap index and its shards, see apps/base/sitemaps.py
+    path("sitemap.xml", base_views.sitemap_index, name="sitemap"),
+    path(
+        "sitemap/<str:language_code>/<int:shard>.xml",
+        base_views.sitemap_shard,
+        name="sitemap_shard",
+    ),
+]
+
+if not settings.DEBUG:
+    # Media files, sent with os.sendfile() or offloaded, see apps/base/sendfile.py
+    urlpatterns.append(
+        path(
+            settings.MEDIA_URL.lstrip("/") + "<path:path>",
+            base_views.serve_media,
+            name="serve_media",
+        )
+    )
+
+urlpatterns = urlpatterns + [
+    # For anything not caught by a more specific rule above, hand over to
+    # Wagtail's page serving mechanism. This should be the last pattern in
+    # the list:
+    path("", include(wagtail_urls)),
+    # Alternatively, if you want Wagtail pages to be served from a subpath
+    # of your site, rather than the site root:
+    #    path("pages/", include(wagtail_urls)),
+]
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
 ]
 
 MIDDLEWARE = [
@@ -67,10 +68,20 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     # CMS functionality
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    "apps.base.middleware.PageCacheMiddleware",
+    "apps.base.middleware.RichTextReferencesMiddleware",
+    "apps.base.middleware.ReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
 
+# Anonymous public reads go to these database aliases, the rest to
+# "default", see apps/base/db.py. After any content change every read goes
+# to the primary for REPLICA_PIN_SECONDS, to cover the replication lag.
+DATABASE_ROUTERS = ["apps.base.db.ReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 10
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -140,7 +151,8 @@ STATICFILES_DIRS = [
 # ManifestStaticFilesStorage is recommended in production, to prevent outdated
 # JavaScript / CSS assets being served from cache (e.g. after a Wagtail upgrade).
 # See https://docs.djangoproject.com/en/4.0/ref/contrib/staticfiles/#manifeststaticfilesstorage
-STATICFILES_STORAGE = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+# This subclass also writes gzip/brotli variants, served by config/wsgi.py
+STATICFILES_STORAGE = "apps.base.staticfiles.CompressedManifestStaticFilesStorage"
 
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 STATIC_URL = "/static/"
@@ -148,6 +160,15 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# Documents and media are sent by apps/base/sendfile.py, with Range
+# support. Set SENDFILE_OFFLOAD to "x-accel-redirect" (with an nginx internal
+# location at SENDFILE_URL aliasing MEDIA_ROOT) or "x-sendfile" to hand
+# files over to the proxy.
+WAGTAILDOCS_SERVE_METHOD = "serve_view"
+SENDFILE_BACKEND = "apps.base.sendfile"
+SENDFILE_OFFLOAD = None
+SENDFILE_URL = "/protected/"
+
 
 # Wagtail settings
 
@@ -155,14 +176,44 @@ WAGTAIL_SITE_NAME = "config"
 
 # Search
 # https://docs.wagtail.org/en/stable/topics/search/backends.html
+# Index updates are queued on save and applied in batches by the
+# `process_index_queue` worker, see apps/search/indexing.py
 WAGTAILSEARCH_BACKENDS = {
     "default": {
         "BACKEND": "wagtail.search.backends.database",
+        "AUTO_UPDATE": False,
     }
 }
 
+# Search hits are buffered in each worker and written in bulk every
+# interval (in seconds) or once this many (query, day) pairs are waiting
+SEARCH_HITS_FLUSH_INTERVAL = 10
+SEARCH_HITS_BUFFER_SIZE = 1000
+
+# Embeds are fetched when pages are published, see apps/base/embeds.py.
+# Use "apps.base.embeds.LocalEmbedFinder" to work without network access.
+WAGTAILEMBEDS_FINDERS = [{"class": "wagtail.embeds.finders.oembed"}]
+
 WAGTAIL_I18N_ENABLED = True
 
+# Full-page cache for anonymous visitors, see apps/base/page_cache.py.
+# Only query parameters listed here are part of the cache key.
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_TIMEOUT = 60 * 10
+PAGE_CACHE_QUERY_PARAMS = ["page", "after"]
+
+# Form submissions are queued and saved and emailed by the
+# `process_form_queue` worker, see apps/base/submissions.py. Failed emails
+# are retried after FORM_EMAIL_RETRY_DELAY seconds, doubling each time.
+FORM_EMAIL_MAX_ATTEMPTS = 8
+FORM_EMAIL_RETRY_DELAY = 60
+
+# Rows read at a time when exporting form submissions
+FORM_EXPORT_CHUNK_SIZE = 2000
+
+# Range of page IDs covered by each sitemap shard
+SITEMAP_SHARD_SIZE = 5000
+
 WAGTAIL_CONTENT_LANGUAGES = LANGUAGES = [
     ("en-us", _("English")),
     ("uk-ua", _("Ukrainian")),
@@ -28,6 +28,14 @@ DATABASES = {
     }
 }
 
+# To try the replica router, copy db.sqlite3 to replica.sqlite3 and uncomment:
+# DATABASES["replica"] = {
+#     "ENGINE": "django.db.backends.sqlite3",
+#     "NAME": os.path.join(BASE_DIR, "replica.sqlite3"),
+#     "TEST": {"MIRROR": "default"},
+# }
+# DATABASE_REPLICAS = ["replica"]
+
 # Base URL to use when referring to full URLs within the Wagtail admin backend -
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 WAGTAILADMIN_BASE_URL = "http://localhost:8000"
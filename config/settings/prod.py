@@ -12,19 +12,60 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
-DATABASES = {"default": dj_database_url.config(default="sqlite:///db.sqlite3")}
+# Connections are kept open between requests and checked before reuse
+DATABASE_CONN_MAX_AGE = int(os.getenv("DATABASE_CONN_MAX_AGE", "600"))
+DATABASES = {
+    "default": dj_database_url.config(
+        default="sqlite:///db.sqlite3", conn_max_age=DATABASE_CONN_MAX_AGE
+    )
+}
 
-# configure CACHES from CACHE_URL environment variable (defaults to locmem if no CACHE_URL is set)
-CACHES = {
-    'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
-        'LOCATION': 'redis://redis:6379/',
-        'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-        }
+# Read replicas, as a comma-separated list of database URLs, see
+# apps/base/db.py
+replica_urls = filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(","))
+for index, url in enumerate(replica_urls):
+    DATABASES["replica{}".format(index + 1)] = {
+        **dj_database_url.parse(url, conn_max_age=DATABASE_CONN_MAX_AGE),
+        "TEST": {"MIRROR": "default"},
     }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+for database in DATABASES.values():
+    database["CONN_HEALTH_CHECKS"] = True
+
+# The shared cache is configured from the CACHE_URL environment variable.
+# Keys read on every request (generation counters, menus, page chrome, site
+# root paths) and rendition URLs are also kept in each worker, see
+# apps/base/two_tier_cache.py
+CACHES = {
+    "default": {
+        "BACKEND": "apps.base.two_tier_cache.TwoTierCache",
+        "LOCATION": "default",
+        "OPTIONS": {
+            "SHARED": "shared",
+            "MAX_ENTRIES": 5000,
+            "LOCAL_KEY_PREFIXES": [
+                "generation:",
+                "navigation:",
+                "chrome:",
+                "wagtail_site_root_paths",
+                "db:",
+            ],
+        },
+    },
+    # Used by Wagtail for rendition lookups by image and filter
+    "renditions": {
+        "BACKEND": "apps.base.two_tier_cache.TwoTierCache",
+        "LOCATION": "renditions",
+        "OPTIONS": {"SHARED": "shared", "MAX_ENTRIES": 10000},
+    },
+    "shared": django_cache_url.config(default="redis://redis:6379/"),
 }
 
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "False") == "True"
+
+SENDFILE_OFFLOAD = os.getenv("SENDFILE_OFFLOAD") or None
+
 # Base URL to use when referring to full URLs within the Wagtail admin backend -
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 WAGTAILADMIN_BASE_URL = "http://localhost:8000"
@@ -0,0 +1,50 @@
+"""
+Settings for workers that only serve the public site, behind a proxy
+routing /admin/ and /django-admin/ to workers running the full settings:
+
+    DJANGO_SETTINGS_MODULE=config.settings.public
+
+The admin apps, their URLs and the messages framework aren't loaded,
+which makes workers start faster and use less memory. Sessions and
+authentication stay, as private pages need them. Run management commands,
+collectstatic in particular, with the full settings.
+"""
+from .prod import *  # noqa: F403, F401
+
+# Apps only the Wagtail and Django admins use. Their models stay in the
+# database; nothing on the public site queries them
+ADMIN_APPS = [
+    "wagtail.users",
+    "wagtail.snippets",
+    "wagtail.admin",
+    "wagtail.locales",
+    "wagtail.contrib.modeladmin",
+    "wagtail.contrib.simple_translation",
+    "wagtail.contrib.styleguide",
+    "django.contrib.admin",
+    "django.contrib.messages",
+]
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "django.contrib.messages.middleware.MessageMiddleware"
+]
+
+ROOT_URLCONF = "config.public_urls"
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": [
+                processor
+                for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.contrib.messages.context_processors.messages"
+            ],
+            # Editors use the full workers, so the userbar is never shown
+            "libraries": {"wagtailuserbar": "apps.base.templatetags.public_userbar"},
+        },
+    }
+]
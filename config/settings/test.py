@@ -0,0 +1,30 @@
+"""
+Settings for the test suite, which runs on SQLite without any services:
+
+    python manage.py test --settings=config.settings.test
+"""
+import tempfile
+
+from .base import *  # noqa: F403, F401
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+    },
+    # A second connection to the test database, standing in for a read
+    # replica, see apps/base/db.py
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "replica.sqlite3"),
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="school-portal-media-")
+
+WAGTAILADMIN_BASE_URL = "http://testserver"
@@ -3,22 +3,13 @@ from django.conf import settings
 from django.urls import include, path, re_path
 from django.contrib import admin
 from wagtail.admin import urls as wagtailadmin_urls
-from wagtail import urls as wagtail_urls
-from wagtail.documents import urls as wagtaildocs_urls
-from wagtail.contrib.sitemaps.views import sitemap
-from apps.search import views as search_views
+from config import public_urls
 
 
 urlpatterns = [
     # Admin
     path("django-admin/", admin.site.urls),
     path("admin/", include(wagtailadmin_urls)),
-    # Documents
-    path("documents/", include(wagtaildocs_urls)),
-    # Search
-    path("search/", search_views.search, name="search"),
-    # Sitemap
-    path("sitemap.xml", sitemap),
 ]
 
 if settings.DEBUG:
@@ -31,12 +22,5 @@ if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns.insert(0, path("__debug__/", include(debug_toolbar.urls)))
 
-urlpatterns = urlpatterns + [
-    # For anything not caught by a more specific rule above, hand over to
-    # Wagtail's page serving mechanism. This should be the last pattern in
-    # the list:
-    path("", include(wagtail_urls)),
-    # Alternatively, if you want Wagtail pages to be served from a subpath
-    # of your site, rather than the site root:
-    #    path("pages/", include(wagtail_urls)),
-]
+# Everything else is the public site, see config/public_urls.py
+urlpatterns = urlpatterns + public_urls.urlpatterns
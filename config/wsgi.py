@@ -18,3 +18,21 @@ load_dotenv()
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
 
 application = get_wsgi_application()
+
+# Serve collected static files, precompressed, before Django's URL resolver
+from django.conf import settings  # noqa: E402
+
+from apps.base.staticfiles import StaticFilesApp  # noqa: E402
+
+application = StaticFilesApp(application, settings.STATIC_ROOT, settings.STATIC_URL)
+
+# Build the typeahead index before the first request rather than during it
+from apps.search.autocomplete import prefix_index  # noqa: E402
+
+prefix_index.warm()
+
+# With gunicorn --preload this module is loaded before the workers fork;
+# they mustn't share the connection the warm-up opened
+from django.db import connections  # noqa: E402
+
+connections.close_all()
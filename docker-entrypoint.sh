@@ -14,5 +14,27 @@ python manage.py collectstatic --noinput --clear
 
 set -xe
 
+echo Starting search index worker
+python manage.py process_index_queue --loop &
+
+echo Starting form submission worker
+python manage.py process_form_queue --loop &
+
+echo Starting rendition worker
+python manage.py process_rendition_queue --loop &
+
 echo Running server
-gunicorn --bind 0.0.0.0:8000 config.wsgi:application --workers 2
\ No newline at end of file
+# SERVER_SETTINGS_MODULE=config.settings.public runs workers serving only the
+# public site; the commands above keep the full settings
+if [ -n "$SERVER_SETTINGS_MODULE" ]; then
+    export DJANGO_SETTINGS_MODULE="$SERVER_SETTINGS_MODULE"
+fi
+
+# The app is loaded once before forking, so workers start at once and
+# share its memory. SERVER_INTERFACE=asgi runs uvicorn workers, see
+# config/asgi.py
+if [ "$SERVER_INTERFACE" = "asgi" ]; then
+    gunicorn --bind 0.0.0.0:8000 config.asgi:application --workers 2 --preload -k uvicorn.workers.UvicornWorker
+else
+    gunicorn --bind 0.0.0.0:8000 config.wsgi:application --workers 2 --preload
+fi
@@ -21,3 +21,95 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 })
 
+
+// Gallery infinite scroll: fetch the next page of images from the JSON feed
+// when the "Load more" link scrolls into view
+function galleryCard(image) {
+  const card = document.createElement('div');
+  card.className = 'picture-card';
+  const figure = document.createElement('figure');
+  figure.className = 'picture-card__image';
+  const img = document.createElement('img');
+  img.src = image.url;
+  img.width = image.width;
+  img.height = image.height;
+  img.alt = image.alt;
+  img.loading = 'lazy';
+  const contents = document.createElement('div');
+  contents.className = 'picture-card__contents';
+  const title = document.createElement('p');
+  title.className = 'picture-card__title';
+  title.textContent = image.title;
+  contents.appendChild(title);
+  figure.append(img, contents);
+  card.appendChild(figure);
+  return card;
+}
+
+const galleryMore = document.querySelector('[data-gallery-more]');
+
+if (galleryMore && 'IntersectionObserver' in window) {
+  let loading = false;
+  const observer = new IntersectionObserver(async (entries) => {
+    if (!entries[0].isIntersecting || loading) {
+      return;
+    }
+    loading = true;
+    const response = await fetch(`${galleryMore.dataset.feedUrl}?after=${galleryMore.dataset.next}`);
+    const data = await response.json();
+    data.images.forEach((image) => {
+      galleryMore.before(galleryCard(image));
+    });
+    if (data.next) {
+      galleryMore.dataset.next = data.next;
+      galleryMore.href = `?after=${data.next}`;
+    } else {
+      observer.disconnect();
+      galleryMore.remove();
+    }
+    loading = false;
+  });
+  observer.observe(galleryMore);
+}
+
+
+// Search typeahead: fill the shared datalist from the autocomplete endpoint,
+// and go straight to a page when one of its suggestions is picked
+const searchSuggestions = document.getElementById('search-suggestions');
+let suggestionUrls = {};
+
+document.querySelectorAll('[data-autocomplete-url]').forEach((input) => {
+  let timeout;
+  input.addEventListener('input', (event) => {
+    // Picking a datalist option fires an input event without a typed inputType
+    const picked = !event.inputType || event.inputType === 'insertReplacementText';
+    if (picked && suggestionUrls[input.value]) {
+      window.location = suggestionUrls[input.value];
+      return;
+    }
+    clearTimeout(timeout);
+    timeout = setTimeout(async () => {
+      const query = encodeURIComponent(input.value);
+      const response = await fetch(`${input.dataset.autocompleteUrl}?q=${query}`);
+      const data = await response.json();
+      suggestionUrls = {};
+      searchSuggestions.replaceChildren(...data.suggestions.map((suggestion) => {
+        if (suggestion.url) {
+          suggestionUrls[suggestion.title] = suggestion.url;
+        }
+        const option = document.createElement('option');
+        option.value = suggestion.title;
+        return option;
+      }));
+    }, 100);
+  });
+});
+
+// Embed facades: swap the thumbnail for the provider's player on click
+document.querySelectorAll('[data-embed-html]').forEach((facade) => {
+  facade.addEventListener('click', () => {
+    const player = document.createElement('div');
+    player.innerHTML = facade.dataset.embedHtml;
+    facade.replaceWith(...player.childNodes);
+  });
+});
@@ -0,0 +1,57 @@
+"""
+An in-memory stand-in for a Redis cache, for testing TwoTierCache without
+a Redis server: a locmem cache whose client records published messages and
+delivers them to subscribers.
+"""
+import queue
+
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = queue.Queue()
+        self.channels = set()
+
+    def subscribe(self, channel):
+        self.channels.add(channel)
+        self.redis.subscribers.append(self)
+
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+        self.subscribers = []
+
+    def publish(self, channel, data):
+        self.published.append((channel, data))
+        for pubsub in self.subscribers:
+            if channel in pubsub.channels:
+                pubsub.messages.put({"data": data})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+
+class FakeClient:
+    def __init__(self):
+        self.redis = FakeRedis()
+
+    def get_client(self, write=True):
+        return self.redis
+
+
+class FakeRedisCache(LocMemCache):
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self.client = FakeClient()
+        self.writes = 0
+
+    def set(self, *args, **kwargs):
+        self.writes += 1
+        return super().set(*args, **kwargs)
@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase
+
+from wagtail.models import PageViewRestriction, Site
+
+from apps.base.cache import get_generation
+from apps.base.models import People, StandardPage
+from apps.search.autocomplete import PrefixIndex, change_key
+
+
+class PrefixIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = Site.objects.get(is_default_site=True).root_page
+        self.parent = self.add_page(self.root, "Bakery", "bakery")
+        self.child = self.add_page(self.parent, "Sourdough bread", "sourdough")
+        # The index of a worker other than the one making the changes
+        self.index = PrefixIndex()
+        self.index.build()
+
+    def add_page(self, parent, title, slug):
+        page = parent.add_child(
+            instance=StandardPage(title=title, slug=slug, live=False)
+        )
+        page.save_revision().publish()
+        return page
+
+    def publish(self, page, **changes):
+        page = StandardPage.objects.get(pk=page.pk)
+        for field, value in changes.items():
+            setattr(page, field, value)
+        page.save_revision().publish()
+
+    def lookup(self, prefix):
+        # Catching up must not rebuild the whole index
+        with mock.patch.object(self.index, "build", side_effect=AssertionError):
+            return self.index.lookup(prefix)
+
+    def test_lookup(self):
+        self.assertEqual(
+            self.lookup("sou"),
+            [{"title": "Sourdough bread", "url": "/bakery/sourdough/", "type": "page"}],
+        )
+        self.assertEqual(self.lookup("bread")[0]["title"], "Sourdough bread")
+        self.assertEqual(self.lookup("xyz"), [])
+
+    def test_changes_are_applied_incrementally(self):
+        self.publish(self.child, title="Rye bread")
+        person = People.objects.create(
+            first_name="Ada", last_name="Baker", job_title="Baker"
+        )
+
+        self.assertEqual(self.lookup("sou"), [])
+        self.assertEqual(self.lookup("rye")[0]["title"], "Rye bread")
+        self.assertEqual(self.lookup("ada")[0]["title"], "Ada Baker")
+
+        self.child.refresh_from_db()
+        self.child.unpublish()
+        person.delete()
+        self.assertEqual(self.lookup("rye"), [])
+        self.assertEqual(self.lookup("ada"), [])
+
+    def test_new_slug_updates_descendant_urls(self):
+        self.publish(self.parent, slug="bakehouse")
+        self.assertEqual(self.lookup("sou")[0]["url"], "/bakehouse/sourdough/")
+
+    def test_restricted_pages_are_left_out(self):
+        restriction = PageViewRestriction.objects.create(
+            page=self.parent, restriction_type=PageViewRestriction.GROUPS
+        )
+        restriction.groups.add(Group.objects.create(name="Staff"))
+        self.assertEqual(self.lookup("sou"), [])
+        self.assertEqual(self.lookup("bak"), [])
+
+        fresh = PrefixIndex()
+        fresh.build()
+        self.assertEqual(fresh.lookup("sou"), [])
+
+        restriction.delete()
+        self.assertEqual(self.lookup("sou")[0]["title"], "Sourdough bread")
+
+    def test_missing_change_record_rebuilds(self):
+        self.publish(self.child, title="Rye bread")
+        cache.delete(change_key(get_generation("autocomplete")))
+        with mock.patch.object(self.index, "build", wraps=self.index.build) as build:
+            self.assertEqual(self.index.lookup("rye")[0]["title"], "Rye bread")
+        build.assert_called_once()
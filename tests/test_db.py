@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.models import Page
+
+from apps.base.db import ReplicaRouter, current_replica
+from apps.base.middleware import ReplicaMiddleware
+from apps.base.models import StandardPage
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(TestCase):
+    # Only the routing decisions are checked, so the replica is never queried
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def read_alias(self, request):
+        # The database the request's reads are routed to
+        def view(request):
+            self.alias = Page.objects.all().db
+            return None
+
+        ReplicaMiddleware(view)(request)
+        return self.alias
+
+    def test_anonymous_reads_go_to_the_replica(self):
+        self.assertEqual(self.read_alias(self.factory.get("/")), "replica")
+        self.assertEqual(self.read_alias(self.factory.head("/")), "replica")
+
+    def test_signed_in_reads_go_to_the_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = "session"
+        self.assertEqual(self.read_alias(request), "default")
+
+    def test_unsafe_requests_go_to_the_primary(self):
+        self.assertEqual(self.read_alias(self.factory.post("/")), "default")
+
+    def test_writes_go_to_the_primary(self):
+        token = current_replica.set("replica")
+        try:
+            self.assertEqual(ReplicaRouter().db_for_write(Page), "default")
+            self.assertEqual(ReplicaRouter().db_for_read(Page), "replica")
+        finally:
+            current_replica.reset(token)
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        page = Page.objects.get(depth=1).add_child(
+            instance=StandardPage(title="Orchard", slug="orchard", live=False)
+        )
+        page.save_revision().publish()
+        self.assertEqual(self.read_alias(self.factory.get("/")), "default")
+
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            page.save_revision().publish()
+        self.assertEqual(self.read_alias(self.factory.get("/")), "replica")
+
+    def test_context_is_reset_after_the_request(self):
+        self.read_alias(self.factory.get("/"))
+        self.assertIsNone(current_replica.get())
+        self.assertEqual(Page.objects.all().db, "default")
@@ -0,0 +1,61 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from wagtail.embeds.models import Embed
+from wagtail.models import Site
+
+from apps.base.embeds import LocalEmbedFinder
+from apps.base.models import StandardPage
+
+VIDEO_URL = "https://www.youtube.com/watch?v=SGJFWirQ3ks"
+
+
+@override_settings(
+    WAGTAILEMBEDS_FINDERS=[
+        {
+            "class": "apps.base.embeds.LocalEmbedFinder",
+            "thumbnail_url": "https://example.com/thumb.jpg",
+        }
+    ]
+)
+class StoredEmbedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.page = Site.objects.get(is_default_site=True).root_page.add_child(
+            instance=StandardPage(
+                title="Videos",
+                slug="videos",
+                live=False,
+                body=json.dumps([{"type": "embed_block", "value": VIDEO_URL}]),
+            )
+        )
+
+    def test_embeds_are_stored_on_publish(self):
+        self.assertFalse(Embed.objects.exists())
+        self.page.save_revision().publish()
+
+        embed = Embed.objects.get()
+        self.assertEqual(embed.url, VIDEO_URL)
+        self.assertEqual(embed.provider_name, "Local")
+        self.assertEqual(embed.thumbnail_url, "https://example.com/thumb.jpg")
+
+    def test_rendering_only_reads_stored_embeds(self):
+        self.page.save_revision().publish()
+        with mock.patch.object(
+            LocalEmbedFinder, "find_embed", side_effect=AssertionError
+        ):
+            response = self.client.get(self.page.url)
+
+        self.assertContains(response, 'class="embed-facade"')
+        self.assertContains(response, "https://example.com/thumb.jpg")
+
+    def test_missing_embed_renders_a_link(self):
+        self.page.save_revision().publish()
+        Embed.objects.all().delete()
+        response = self.client.get(self.page.url)
+        self.assertContains(
+            response, '<a href="{0}">{0}</a>'.format(VIDEO_URL), html=True
+        )
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import Group
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Collection, PageViewRestriction, Site
+
+from apps.base.models import GalleryPage
+
+
+class GalleryFeedTests(TestCase):
+    def setUp(self):
+        self.collection = Collection.get_first_root_node().add_child(name="Trips")
+        self.image = Image.objects.create(
+            title="Harbour",
+            file=get_test_image_file(),
+            collection=self.collection,
+        )
+        self.page = Site.objects.get(is_default_site=True).root_page.add_child(
+            instance=GalleryPage(
+                title="Trips", slug="trips", collection=self.collection
+            )
+        )
+
+    def get_feed(self, collection):
+        return self.client.get(reverse("gallery_images", args=[collection.pk]))
+
+    def test_collection_of_a_live_gallery(self):
+        response = self.get_feed(self.collection)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [image["title"] for image in response.json()["images"]], ["Harbour"]
+        )
+
+    def test_collection_without_a_live_gallery(self):
+        self.page.unpublish()
+        self.assertEqual(self.get_feed(self.collection).status_code, 404)
+        other = Collection.get_first_root_node().add_child(name="Staff")
+        self.assertEqual(self.get_feed(other).status_code, 404)
+
+    def test_collection_of_a_restricted_gallery(self):
+        restriction = PageViewRestriction.objects.create(
+            page=self.page, restriction_type=PageViewRestriction.GROUPS
+        )
+        restriction.groups.add(Group.objects.create(name="Staff"))
+        self.assertEqual(self.get_feed(self.collection).status_code, 404)
+
+    def test_template_shows_titles(self):
+        html = render_to_string(
+            "tags/gallery.html",
+            {"images": [self.image], "image": self.image},
+            request=RequestFactory().get("/"),
+        )
+        self.assertIn('<p class="picture-card__title">Harbour</p>', html)
+        self.assertIn("</div>\nHarbour\n", html)
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from wagtail.models import Page
+
+from apps.base import page_cache
+from apps.base.cache import get_generation
+from apps.base.models import StandardPage
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def store(self, path, page_ids):
+        request = self.factory.get(path)
+        page_cache.cache_response(request, HttpResponse(path), page_ids)
+        return request
+
+    def test_purge_only_drops_dependent_entries(self):
+        first = self.store("/first/", [1, 2])
+        second = self.store("/second/", [1, 3])
+        third = self.store("/third/", [3])
+
+        page_cache.purge_pages([2])
+
+        self.assertIsNone(page_cache.get_cached_response(first))
+        self.assertEqual(page_cache.get_cached_response(second).content, b"/second/")
+        self.assertEqual(page_cache.get_cached_response(third).content, b"/third/")
+
+        page_cache.purge_pages([1])
+        self.assertIsNone(page_cache.get_cached_response(second))
+        self.assertIsNotNone(page_cache.get_cached_response(third))
+
+    def test_entries_stored_after_a_purge_are_served(self):
+        page_cache.purge_pages([1])
+        request = self.store("/first/", [1])
+        self.assertEqual(page_cache.get_cached_response(request).content, b"/first/")
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PublishPurgeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.get(depth=1).add_child(
+            instance=StandardPage(title="Orchard", slug="orchard", live=False)
+        )
+        self.page.save_revision().publish()
+
+    def publish(self, **changes):
+        page = StandardPage.objects.get(pk=self.page.pk)
+        for field, value in changes.items():
+            setattr(page, field, value)
+        before = get_generation("pagecache")
+        page.save_revision().publish()
+        return get_generation("pagecache") != before
+
+    def store(self):
+        request = RequestFactory().get("/orchard/")
+        page_cache.cache_response(request, HttpResponse("Orchard"), [self.page.pk])
+        self.assertIsNotNone(page_cache.get_cached_response(request))
+        return request
+
+    def test_unchanged_menu_only_purges_the_page(self):
+        request = self.store()
+        self.assertFalse(self.publish(title="Apple orchard"))
+        self.assertIsNone(page_cache.get_cached_response(request))
+
+    def test_showing_in_menus_purges_everything(self):
+        self.assertTrue(self.publish(show_in_menus=True))
+        self.assertFalse(self.publish())
+        self.assertTrue(self.publish(title="Apple orchard"))
+        self.assertTrue(self.publish(show_in_menus=False))
+
+    def test_changing_slug_purges_everything(self):
+        self.assertTrue(self.publish(slug="apple-orchard"))
+
+    def test_republishing_after_unpublish_purges_everything_for_menu_pages(self):
+        self.publish(show_in_menus=True)
+        self.page.refresh_from_db()
+        self.page.unpublish()
+        self.assertTrue(self.publish())
@@ -0,0 +1,67 @@
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+
+from apps.base.models import People, RenditionQueueEntry
+from apps.base.people import get_thumbnails
+from apps.base.renditions import PERSON_THUMB_FILTER_SPEC, process_queue
+
+
+class RenditionQueueTests(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Portrait", file=get_test_image_file(), width=640, height=480
+        )
+        self.person = People.objects.create(
+            first_name="Ada", last_name="Lovelace", job_title="Head", image=self.image
+        )
+
+    def get_thumbnails(self):
+        person = People.objects.get(pk=self.person.pk)
+        return get_thumbnails([person])
+
+    def break_image(self):
+        # The file no longer decodes, so no rendition can be generated
+        self.image.file.save("broken.png", ContentFile(b"not an image"), save=False)
+        Image.objects.filter(pk=self.image.pk).update(file=self.image.file.name)
+
+    def test_missing_thumbnail_is_queued_then_generated(self):
+        self.assertEqual(self.get_thumbnails(), {})
+        entry = RenditionQueueEntry.objects.get()
+        self.assertEqual(entry.filter_spec, PERSON_THUMB_FILTER_SPEC)
+
+        self.assertEqual(process_queue(), 1)
+
+        self.assertFalse(RenditionQueueEntry.objects.exists())
+        thumbnail = self.get_thumbnails()[self.person.pk]
+        self.assertEqual(thumbnail.filter_spec, PERSON_THUMB_FILTER_SPEC)
+
+    def test_failed_thumbnail_is_not_queued_again(self):
+        self.break_image()
+        self.get_thumbnails()
+        with self.assertLogs("apps.base.renditions", "ERROR"):
+            self.assertEqual(process_queue(), 1)
+
+        entry = RenditionQueueEntry.objects.get()
+        self.assertTrue(entry.failed)
+        # Not pending any more, and not picked up by the worker again
+        self.assertEqual(self.get_thumbnails(), {self.person.pk: None})
+        self.assertEqual(RenditionQueueEntry.objects.count(), 1)
+        self.assertEqual(process_queue(), 0)
+
+    def test_saving_the_image_retries_failed_thumbnails(self):
+        self.break_image()
+        self.get_thumbnails()
+        with self.assertLogs("apps.base.renditions", "ERROR"):
+            process_queue()
+
+        self.image.file = get_test_image_file()
+        self.image.save()
+
+        self.assertFalse(RenditionQueueEntry.objects.exists())
+        self.assertEqual(self.get_thumbnails(), {})
+        self.assertFalse(RenditionQueueEntry.objects.get().failed)
+        process_queue()
+        self.assertIn(self.person.pk, self.get_thumbnails())
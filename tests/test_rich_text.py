@@ -0,0 +1,50 @@
+import json
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.documents import get_document_model
+from wagtail.models import Site
+
+from apps.base.models import FooterText, StandardPage
+
+
+def link(document):
+    return '<a linktype="document" id="{}">{}</a>'.format(document.pk, document.title)
+
+
+class FooterReferencesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Document = get_document_model()
+        self.report = Document.objects.create(
+            title="Report", file=ContentFile(b"report", name="report.pdf")
+        )
+        self.policy = Document.objects.create(
+            title="Policy", file=ContentFile(b"policy", name="policy.pdf")
+        )
+        FooterText.objects.create(body="<p>{}</p>".format(link(self.policy)))
+        root = Site.objects.get(is_default_site=True).root_page
+        self.page = root.add_child(
+            instance=StandardPage(
+                title="About",
+                slug="about",
+                body=json.dumps(
+                    [{"type": "paragraph_block", "value": link(self.report)}]
+                ),
+            )
+        )
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.page.url)
+        self.assertContains(response, self.report.url)
+        self.assertContains(response, self.policy.url)
+        document_table = get_document_model()._meta.db_table
+        return [query["sql"] for query in queries if document_table in query["sql"]]
+
+    def test_footer_links_resolved_with_the_page(self):
+        self.assertEqual(len(self.get()), 1)
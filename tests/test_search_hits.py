@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+
+from wagtail.search.models import QueryDailyHits
+
+from apps.search.hits import HitBuffer
+
+
+class HitBufferTests(TestCase):
+    def setUp(self):
+        self.buffer = HitBuffer(interval=10, max_size=1000)
+
+    def record(self, *query_strings):
+        # Without starting the background thread
+        with mock.patch.object(self.buffer, "ensure_thread"):
+            for query_string in query_strings:
+                self.buffer.record(query_string)
+
+    def get_hits(self):
+        return dict(QueryDailyHits.objects.values_list("query__query_string", "hits"))
+
+    def test_flush_writes_totals(self):
+        self.record("Orchard", "orchard", "apples")
+        self.buffer.flush()
+        self.assertEqual(self.get_hits(), {"orchard": 2, "apples": 1})
+        self.assertFalse(self.buffer.counts)
+
+        self.record("orchard")
+        self.buffer.flush()
+        self.assertEqual(self.get_hits(), {"orchard": 3, "apples": 1})
+
+    def test_failed_flush_keeps_hits(self):
+        self.record("orchard", "orchard")
+        with mock.patch.object(
+            QueryDailyHits.objects, "bulk_create", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                self.buffer.flush()
+        self.assertEqual(self.get_hits(), {})
+
+        # Hits recorded meanwhile are added to the ones kept
+        self.record("orchard")
+        self.buffer.flush()
+        self.assertEqual(self.get_hits(), {"orchard": 3})
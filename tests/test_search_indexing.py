@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+
+from wagtail.models import Page
+
+from apps.base.models import StandardPage
+from apps.search.cache import get_search_results
+from apps.search.indexing import (
+    claim_entries,
+    enqueue_instance,
+    index_entries,
+    process_queue,
+)
+from apps.search.models import IndexQueueEntry
+
+
+class IndexQueueTests(TestCase):
+    def test_results_refresh_once_batch_is_indexed(self):
+        page = Page.objects.get(depth=1).add_child(
+            instance=StandardPage(title="Orchard", slug="orchard")
+        )
+        self.assertTrue(IndexQueueEntry.objects.exists())
+        # Searched before the worker runs: the index doesn't know the page yet
+        self.assertEqual(get_search_results("orchard"), [])
+
+        process_queue()
+
+        self.assertFalse(IndexQueueEntry.objects.exists())
+        self.assertEqual(
+            get_search_results("orchard"), [(page.pk, page.content_type_id)]
+        )
+
+    def add_page(self, title, slug):
+        return Page.objects.get(depth=1).add_child(
+            instance=StandardPage(title=title, slug=slug)
+        )
+
+    def test_claimed_entries_are_skipped(self):
+        self.add_page("Orchard", "orchard")
+        self.add_page("Dairy", "dairy")
+        first = claim_entries(1)
+        second = claim_entries(10)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(claim_entries(10), [])
+
+    def test_saving_while_indexing_keeps_the_entry(self):
+        page = self.add_page("Orchard", "orchard")
+
+        def index_and_save(entries):
+            index_entries(entries)
+            # An editor saves the page while the batch is being indexed
+            enqueue_instance(page)
+
+        with mock.patch(
+            "apps.search.indexing.index_entries", side_effect=index_and_save
+        ):
+            self.assertEqual(process_queue(), 1)
+
+        entry = IndexQueueEntry.objects.get()
+        self.assertIsNone(entry.claimed_until)
+        self.assertEqual(process_queue(), 1)
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    def test_failed_batch_releases_its_claims(self):
+        self.add_page("Orchard", "orchard")
+        with mock.patch(
+            "apps.search.indexing.index_entries", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                process_queue()
+        self.assertIsNone(IndexQueueEntry.objects.get().claimed_until)
+        self.assertEqual(process_queue(), 1)
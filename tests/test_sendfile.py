@@ -0,0 +1,132 @@
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+
+from wagtail.documents import get_document_model
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+
+from apps.base.sendfile import sendfile
+from apps.base.views import serve_media
+
+CONTENT = bytes(range(256)) * 4
+
+
+class DocumentServeTests(TestCase):
+    def setUp(self):
+        self.document = get_document_model().objects.create(
+            title="Report", file=ContentFile(CONTENT, name="report.pdf")
+        )
+
+    def get(self, **headers):
+        response = self.client.get(self.document.url, **headers)
+        return response, b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response, content = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], "1024")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertNotIn("Content-Encoding", response)
+        # PDFs are shown inline by default, see WAGTAILDOCS_INLINE_CONTENT_TYPES
+        self.assertEqual(
+            response["Content-Disposition"],
+            'inline; filename="{}"'.format(self.document.filename),
+        )
+        self.assertEqual(content, CONTENT)
+
+    def test_range(self):
+        response, content = self.get(HTTP_RANGE="bytes=0-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(response["Content-Range"], "bytes 0-9/1024")
+        self.assertEqual(content, CONTENT[:10])
+
+    def test_suffix_range(self):
+        response, content = self.get(HTTP_RANGE="bytes=-24")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Length"], "24")
+        self.assertEqual(response["Content-Range"], "bytes 1000-1023/1024")
+        self.assertEqual(content, CONTENT[-24:])
+
+    def test_range_not_satisfiable(self):
+        response = self.client.get(self.document.url, HTTP_RANGE="bytes=2000-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+        self.assertEqual(response.content, b"")
+
+    def test_stale_if_range_gets_whole_file(self):
+        response, content = self.get(HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], "1024")
+        self.assertEqual(content, CONTENT)
+
+    def test_not_modified(self):
+        etag = self.get()[0]["ETag"]
+        response = self.client.get(self.document.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get("Content-Length", "0"), "0")
+
+
+class SendfileBackendTests(TestCase):
+    def setUp(self):
+        self.document = get_document_model().objects.create(
+            title="Report", file=ContentFile(CONTENT, name="report.pdf")
+        )
+
+    def test_attachment(self):
+        request = RequestFactory().get("/")
+        response = sendfile(
+            request,
+            self.document.file.path,
+            mimetype="application/pdf",
+            attachment=True,
+            attachment_filename="résumé.pdf",
+        )
+        self.assertEqual(
+            response["Content-Disposition"],
+            "attachment; filename*=utf-8''r%C3%A9sum%C3%A9.pdf",
+        )
+        response.close()
+
+    def test_range_with_attachment(self):
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=10-19")
+        response = sendfile(
+            request,
+            self.document.file.path,
+            mimetype="application/pdf",
+            attachment=True,
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="{}"'.format(self.document.filename),
+        )
+        response.close()
+
+
+class MediaServeTests(TestCase):
+    def setUp(self):
+        self.document = get_document_model().objects.create(
+            title="Report", file=ContentFile(CONTENT, name="report.pdf")
+        )
+        self.request = RequestFactory().get("/")
+
+    def test_documents_are_not_served(self):
+        for path in (
+            self.document.file.name,
+            "images/../" + self.document.file.name,
+            "images/./../" + self.document.file.name,
+            "../" + self.document.file.name,
+        ):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                serve_media(self.request, path)
+
+    def test_image_files_are_served(self):
+        image = Image.objects.create(title="Harbour", file=get_test_image_file())
+        response = serve_media(self.request, image.file.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        response.close()
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from wagtail.models import Site
+
+from apps.base.cache import get_generation
+from apps.base.models import StandardPage
+from apps.base.sitemaps import get_shard, shard_generation
+
+
+# One page per shard, so every page's shard can be told apart
+@override_settings(SITEMAP_SHARD_SIZE=1)
+class SitemapInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.parent = self.add_page(root, "Bakery", "bakery")
+        self.child = self.add_page(self.parent, "Sourdough", "sourdough")
+        self.sibling = self.add_page(root, "Dairy", "dairy")
+
+    def add_page(self, parent, title, slug):
+        page = parent.add_child(
+            instance=StandardPage(title=title, slug=slug, live=False)
+        )
+        page.save_revision().publish()
+        return page
+
+    def get_generations(self):
+        return {
+            page.pk: get_generation(
+                shard_generation(page.locale_id, get_shard(page.pk))
+            )
+            for page in (self.parent, self.child, self.sibling)
+        }
+
+    def publish(self, **changes):
+        page = StandardPage.objects.get(pk=self.parent.pk)
+        for field, value in changes.items():
+            setattr(page, field, value)
+        before = self.get_generations()
+        page.save_revision().publish()
+        after = self.get_generations()
+        return {pk for pk in before if before[pk] != after[pk]}
+
+    def test_publish_bumps_the_page_shard(self):
+        self.assertEqual(self.publish(title="Bakehouse"), {self.parent.pk})
+
+    def test_new_slug_bumps_descendant_shards(self):
+        self.assertEqual(
+            self.publish(slug="bakehouse"), {self.parent.pk, self.child.pk}
+        )
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from apps.base.staticfiles import StaticFiles, choose_encoding
+
+CSS = "body { color: #333; }\n" * 100
+
+
+class CollectStaticTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        with open(os.path.join(self.source, "site.css"), "w") as f:
+            f.write(CSS)
+
+    def collectstatic(self):
+        with override_settings(
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATICFILES_STORAGE=(
+                "apps.base.staticfiles.CompressedManifestStaticFilesStorage"
+            ),
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            return staticfiles_storage.stored_name("site.css")
+
+    def test_compressed_variants_are_written(self):
+        hashed_name = self.collectstatic()
+        for name in ("site.css", hashed_name):
+            for suffix in (".gz", ".br"):
+                self.assertTrue(
+                    os.path.isfile(os.path.join(self.root, name + suffix)),
+                    name + suffix,
+                )
+
+    def test_best_variant_is_served(self):
+        hashed_name = self.collectstatic()
+        static_files = StaticFiles(self.root, "/static/")
+        url = "/static/" + hashed_name
+
+        def encoding(accept_encoding):
+            status, headers, path = static_files.get("GET", url, accept_encoding, None)
+            return dict(headers).get("Content-Encoding")
+
+        self.assertEqual(encoding("gzip, deflate, br"), "br")
+        self.assertEqual(encoding("gzip"), "gzip")
+        self.assertEqual(encoding(""), None)
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    def test_q_values(self):
+        available = {None, "br", "gzip"}
+        for accept_encoding, expected in [
+            ("br, gzip", "br"),
+            ("gzip, br", "br"),
+            ("br;q=0, gzip", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("gzip;q=0", None),
+            ("br;q=0, gzip;q=0", None),
+            ("identity", None),
+            ("*", "br"),
+            ("*;q=0, gzip", "gzip"),
+            ("brotli, xgzip", None),
+            ("BR; Q=1", "br"),
+            ("gzip;q=x", None),
+        ]:
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertEqual(choose_encoding(accept_encoding, available), expected)
+
+    def test_only_available_variants(self):
+        self.assertEqual(choose_encoding("br, gzip", {None, "gzip"}), "gzip")
+        self.assertEqual(choose_encoding("br", {None, "gzip"}), None)
@@ -0,0 +1,211 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from wagtail.contrib.forms.models import FormSubmission
+from wagtail.models import Page
+
+from apps.base.models import FormField, FormPage, QueuedSubmission
+from apps.base.submissions import CLAIM_TIMEOUT, process_queue
+
+
+class StubBackend(EmailBackend):
+    """
+    The locmem backend, counting connections, that can be told to fail on
+    opening or for some recipients, like an unreachable or picky SMTP server.
+    """
+
+    connections = 0
+    refuse_connections = False
+    failing_recipients = set()
+
+    def open(self):
+        if StubBackend.refuse_connections:
+            raise ConnectionRefusedError("Connection refused")
+        StubBackend.connections += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if StubBackend.failing_recipients & set(message.to):
+                raise OSError("Recipient rejected")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="tests.test_submissions.StubBackend",
+    FORM_EMAIL_MAX_ATTEMPTS=3,
+    FORM_EMAIL_RETRY_DELAY=60,
+)
+class FormQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Page.objects.get(depth=1)
+        cls.page = root.add_child(
+            instance=FormPage(
+                title="Contact",
+                slug="contact",
+                to_address="office@example.com",
+                from_address="site@example.com",
+                subject="New enquiry",
+                body=[],
+            )
+        )
+        FormField.objects.create(page=cls.page, label="Name", field_type="singleline")
+        FormField.objects.create(page=cls.page, label="Visit", field_type="date")
+        cls.other_page = root.add_child(
+            instance=FormPage(
+                title="Complaints",
+                slug="complaints",
+                to_address="complaints@example.com",
+                subject="Complaint",
+                body=[],
+            )
+        )
+        FormField.objects.create(
+            page=cls.other_page, label="Name", field_type="singleline"
+        )
+
+    def setUp(self):
+        StubBackend.connections = 0
+        StubBackend.refuse_connections = False
+        StubBackend.failing_recipients = set()
+
+    def submit(self, page=None, name="Ada", visit="2026-03-04"):
+        page = page or self.page
+        form = page.get_form({"name": name, "visit": visit}, page=page, user=None)
+        self.assertTrue(form.is_valid(), form.errors)
+        page.process_form_submission(form)
+
+    def make_due(self):
+        QueuedSubmission.objects.update(next_attempt_at=timezone.now())
+
+    def test_submissions_are_only_queued(self):
+        self.submit()
+        self.assertEqual(QueuedSubmission.objects.count(), 1)
+        self.assertFalse(FormSubmission.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_submit_view_queues_through_the_page(self):
+        with mock.patch.object(
+            FormPage, "process_form_submission", autospec=True
+        ) as process:
+            response = self.client.post(
+                reverse("form_submit", args=[self.page.pk]),
+                {"name": "Ada", "visit": "2026-03-04"},
+            )
+        self.assertEqual(response.status_code, 200)
+        page, form = process.call_args.args
+        self.assertEqual(page.pk, self.page.pk)
+        self.assertEqual(form.cleaned_data["name"], "Ada")
+
+    def test_batch_is_saved_and_emailed_over_one_connection(self):
+        self.submit(name="Ada")
+        self.submit(name="Grace")
+        self.submit(page=self.other_page, name="Alan")
+
+        self.assertEqual(process_queue(), 3)
+
+        self.assertEqual(StubBackend.connections, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(FormSubmission.objects.count(), 3)
+        self.assertFalse(QueuedSubmission.objects.exists())
+        message = mail.outbox[0]
+        self.assertEqual(message.subject, "New enquiry")
+        self.assertEqual(message.to, ["office@example.com"])
+        self.assertEqual(message.from_email, "site@example.com")
+        self.assertEqual(message.extra_headers["Auto-Submitted"], "auto-generated")
+
+    def test_email_formats_dates_like_wagtail(self):
+        self.submit(visit="2026-03-04")
+        process_queue()
+        self.assertEqual(mail.outbox[0].body, "Name: Ada\nVisit: 03/04/2026")
+
+    def test_batch_size(self):
+        for name in ("Ada", "Grace", "Alan"):
+            self.submit(name=name)
+        self.assertEqual(process_queue(batch_size=2), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(QueuedSubmission.objects.count(), 1)
+        self.assertEqual(process_queue(batch_size=2), 1)
+        self.assertEqual(process_queue(batch_size=2), 0)
+
+    def test_failed_email_is_retried_with_backoff(self):
+        StubBackend.failing_recipients = {"office@example.com"}
+        self.submit()
+        self.submit(page=self.other_page)
+
+        started = timezone.now()
+        self.assertEqual(process_queue(), 2)
+
+        # The other email went out, and both submissions are saved once
+        self.assertEqual([m.to for m in mail.outbox], [["complaints@example.com"]])
+        self.assertEqual(FormSubmission.objects.count(), 2)
+        entry = QueuedSubmission.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, "Recipient rejected")
+        self.assertIsNotNone(entry.submission_id)
+        self.assertGreaterEqual(entry.next_attempt_at, started + timedelta(seconds=60))
+        self.assertLess(entry.next_attempt_at, started + timedelta(seconds=120))
+
+        # Not due yet
+        self.assertEqual(process_queue(), 0)
+
+        self.make_due()
+        started = timezone.now()
+        process_queue()
+        entry.refresh_from_db()
+        self.assertEqual(entry.attempts, 2)
+        self.assertGreaterEqual(entry.next_attempt_at, started + timedelta(seconds=120))
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+        StubBackend.failing_recipients = set()
+        self.make_due()
+        process_queue()
+        self.assertFalse(QueuedSubmission.objects.exists())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        StubBackend.failing_recipients = {"office@example.com"}
+        self.submit()
+        process_queue()
+        self.make_due()
+        process_queue()
+        self.make_due()
+        with self.assertLogs("apps.base.submissions", "ERROR") as logs:
+            process_queue()
+
+        self.assertIn("Gave up emailing form submission", logs.output[0])
+        self.assertFalse(QueuedSubmission.objects.exists())
+        self.assertEqual(FormSubmission.objects.count(), 1)
+        self.assertEqual(mail.outbox, [])
+
+    def test_unreachable_server_retries_every_email(self):
+        StubBackend.refuse_connections = True
+        self.submit(name="Ada")
+        self.submit(name="Grace")
+        process_queue()
+        self.assertEqual(
+            sorted(QueuedSubmission.objects.values_list("attempts", flat=True)),
+            [1, 1],
+        )
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_claimed_entries_are_not_due(self):
+        self.submit()
+        QueuedSubmission.objects.update(next_attempt_at=timezone.now() + CLAIM_TIMEOUT)
+        self.assertEqual(process_queue(), 0)
+
+    def test_page_without_recipients_only_saves(self):
+        FormPage.objects.filter(pk=self.page.pk).update(to_address="")
+        self.submit()
+        process_queue()
+        self.assertEqual(FormSubmission.objects.count(), 1)
+        self.assertFalse(QueuedSubmission.objects.exists())
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,130 @@
+import json
+import time
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from apps.base import two_tier_cache
+from tests.fake_redis import FakeRedis
+
+
+def two_tier(location):
+    return {
+        "BACKEND": "apps.base.two_tier_cache.TwoTierCache",
+        "LOCATION": location,
+        "OPTIONS": {
+            "SHARED": "shared",
+            "CHANNEL": "invalidation",
+            "LOCAL_KEY_PREFIXES": ["hot:"],
+        },
+    }
+
+
+# "worker1" and "worker2" have their own local tier, as two processes would
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "worker1": two_tier("worker1"),
+        "worker2": two_tier("worker2"),
+        "shared": {"BACKEND": "tests.fake_redis.FakeRedisCache"},
+    }
+)
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self):
+        two_tier_cache.local_tiers.clear()
+        self.worker1 = caches["worker1"]
+        self.worker2 = caches["worker2"]
+        self.shared = caches["shared"]
+        self.shared.clear()
+        self.redis = self.shared.client.redis = FakeRedis()
+        # Messages are delivered by calling receive() rather than through
+        # the subscriber threads
+        self.worker1.ensure_subscriber = self.worker2.ensure_subscriber = lambda: None
+
+    def deliver(self):
+        for channel, data in self.redis.published:
+            self.worker1.receive(data)
+            self.worker2.receive(data)
+        self.redis.published.clear()
+
+    def test_hits_are_served_locally(self):
+        self.shared.set("hot:menu", "menu")
+        self.assertEqual(self.worker1.get("hot:menu"), "menu")
+        self.shared.set("hot:menu", "changed behind its back")
+        self.assertEqual(self.worker1.get("hot:menu"), "menu")
+        self.assertEqual(self.worker1.stats()["local_hit_rate"], 0.5)
+
+    def test_other_keys_skip_the_local_tier(self):
+        self.worker1.set("cold:page", "page")
+        self.shared.set("cold:page", "changed")
+        self.assertEqual(self.worker1.get("cold:page"), "changed")
+        self.assertEqual(self.redis.published, [])
+
+    def test_set_evicts_other_workers(self):
+        self.worker1.set("hot:menu", "old")
+        self.assertEqual(self.worker2.get("hot:menu"), "old")
+        self.deliver()
+
+        self.worker1.set("hot:menu", "new")
+        self.assertEqual(
+            json.loads(self.redis.published[0][1])["keys"],
+            [self.worker1.make_key("hot:menu")],
+        )
+        self.deliver()
+        self.assertEqual(self.worker1.get("hot:menu"), "new")
+        self.assertEqual(self.worker2.get("hot:menu"), "new")
+
+    def test_setting_an_unchanged_value_is_a_noop(self):
+        self.worker1.set("hot:rendition", {"url": "/media/a.jpg"})
+        self.assertEqual(self.worker2.get("hot:rendition"), {"url": "/media/a.jpg"})
+        self.redis.published.clear()
+        writes = self.shared.writes
+
+        # As Wagtail does on every rendition lookup
+        self.worker1.set("hot:rendition", {"url": "/media/a.jpg"})
+        self.worker2.set("hot:rendition", {"url": "/media/a.jpg"})
+
+        self.assertEqual(self.shared.writes, writes)
+        self.assertEqual(self.redis.published, [])
+
+    def test_delete_and_incr_evict_other_workers(self):
+        self.worker1.set("hot:generation", 1)
+        self.worker1.set("hot:footer", "footer")
+        self.worker2.get("hot:generation")
+        self.worker2.get("hot:footer")
+        self.deliver()
+
+        self.worker1.incr("hot:generation")
+        self.worker1.delete("hot:footer")
+        self.deliver()
+        self.assertEqual(self.worker2.get("hot:generation"), 2)
+        self.assertIsNone(self.worker2.get("hot:footer"))
+
+    def test_own_messages_are_ignored(self):
+        self.worker1.set("hot:menu", "menu")
+        self.deliver()
+        self.assertEqual(self.worker1.stats()["entries"], 1)
+
+    def test_clear_empties_every_local_tier(self):
+        self.worker1.set("hot:menu", "menu")
+        self.worker2.get("hot:menu")
+        self.worker1.clear()
+        self.deliver()
+        self.assertEqual(self.worker2.stats()["entries"], 0)
+        self.assertIsNone(self.worker2.get("hot:menu"))
+
+    def test_subscriber_thread_receives_invalidations(self):
+        del self.worker2.ensure_subscriber
+        self.worker2.get("hot:menu")
+        subscribed = time.monotonic() + 5
+        while not self.redis.subscribers and time.monotonic() < subscribed:
+            time.sleep(0.01)
+        self.assertTrue(self.worker2.local.subscriber.is_alive())
+
+        self.worker1.set("hot:menu", "old")
+        self.assertEqual(self.worker2.get("hot:menu"), "old")
+        self.worker1.set("hot:menu", "new")
+        evicted = time.monotonic() + 5
+        while self.worker2.stats()["entries"] and time.monotonic() < evicted:
+            time.sleep(0.01)
+        self.assertEqual(self.worker2.get("hot:menu"), "new")